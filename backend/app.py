@@ -1,83 +1,144 @@
 import os
 import re
-import spacy
-from flask import Flask, request, jsonify, render_template
+import logging
+import tempfile
+import json
+import threading
+import time
+from flask import Flask, Request, Response, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from contextlib import contextmanager
 from PyPDF2 import PdfReader
 from docx import Document
+import skill_tables
+from records import CertificationEntry, EducationEntry, ExperienceEntry, ProjectEntry
+import batch_parser
+import ocr
+import async_jobs
+import compression
+import resume_cache
+from resume_analyzer import ResumeAnalyzer
+import metrics
+from metrics import timed
+
+class SpooledRequest(Request):
+    # Keep uploads in memory and only spill to a temporary file once they
+    # grow past SPOOL_MAX_SIZE.
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=app.config['SPOOL_MAX_SIZE'])
 
 app = Flask(__name__)
+app.request_class = SpooledRequest
+logger = logging.getLogger(__name__)
 CORS(app, resources={r"/upload": {"origins": "http://localhost:5173"}})
 
-# Load the SpaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
-
 # Configuration
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-
-# Ensure upload folder exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# Skill Database (Extensive)
-skill_db = {
-    "Microsoft Office", "Product Management", "Roadmap Planning", "Agile Methodologies",
-    "Data Analysis", "Market Research", "Business Analytics", "Wireframing",
-    "Prototyping", "SQL", "Python", "Strategic Thinking", "Stakeholder Management",
-    "Leadership", "Problem Solving", "Critical Thinking", "Adaptability", "Java",
-    "HTML", "CSS", "JavaScript", "Next.js", "MySQL", "MongoDB", "Git", "GitHub",
-    "Figma", "Koha", "PostgreSQL", "Firebase", "Unit Testing", "TypeScript", "SSR",
-    "Vercel", "OOPS", "Data Structures", "Algorithms", "Database Optimization",
-    "AWS", "Azure", "Docker", "Kubernetes", "CI/CD", "RESTful APIs", "GraphQL",
-    "Machine Learning", "Deep Learning", "Natural Language Processing", "Data Science",
-    "Statistical Analysis", "Communication Skills", "Teamwork", "Project Management",
-    "Scrum", "Kanban", "UI/UX Design", "Responsive Design", "Mobile Development",
-    "iOS Development", "Android Development", "React", "Angular", "Vue.js", "Node.js",
-    "Express.js", "Django", "Flask", "Ruby on Rails", "C++", "C#", "Go", "Swift",
-    "Kotlin", "PHP", "Bash Scripting", "PowerShell", "Linux", "Windows Server",
-    "Networking", "Cybersecurity", "Cloud Computing", "DevOps", "Big Data", "Spark",
-    "Hadoop", "Tableau", "Power BI", "Data Visualization", "Database Design", "SEO",
-    "Digital Marketing", "Social Media Marketing", "Content Creation", "Technical Writing",
-    "Negotiation", "Presentation Skills", "Mentoring", "Coaching", "Time Management",
-    "Budgeting", "Risk Management", "Compliance", "Auditing", "Process Improvement"
+app.config['SPOOL_MAX_SIZE'] = int(os.environ.get('SPOOL_MAX_SIZE', 5 * 1024 * 1024))
+app.config['BATCH_WORKERS'] = batch_parser.DEFAULT_WORKERS
+app.config['RESUME_CACHE_MAX_BYTES'] = int(os.environ.get('RESUME_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESUME_CACHE_DB'] = os.environ.get('RESUME_CACHE_DB')
+app.config['NER_FALLBACK'] = os.environ.get('NER_FALLBACK', '1') != '0'
+app.config['ASYNC_MAX_PENDING'] = int(os.environ.get('ASYNC_MAX_PENDING', 64))
+app.config['ASYNC_RESULT_TTL'] = float(os.environ.get('ASYNC_RESULT_TTL', 600))
+app.config['ASYNC_QUEUE_DB'] = os.environ.get('ASYNC_QUEUE_DB')
+app.config['ASYNC_EVENTS_TIMEOUT'] = float(os.environ.get('ASYNC_EVENTS_TIMEOUT', 300))
+app.config['ANALYZE_MAX_PROFILES'] = int(os.environ.get('ANALYZE_MAX_PROFILES', 256))
+app.config['OCR_ENABLED'] = os.environ.get('OCR_ENABLED', '1') != '0'
+
+# Bump whenever a parsing change alters the output for the same input
+PARSER_VERSION = 4
+
+skill_db = skill_tables.SKILL_DB
+skill_normalizer = skill_tables.get_normalizer()
+
+SECTION_HEADERS = {
+    "contact": ["contact information", "contact", "personal information"],
+    "skills": ["skills", "technical skills", "core competencies", "expertise", "proficiencies"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "work history"],
+    "education": ["education", "academic background", "academic history", "educational background"],
+    "certifications": ["certifications", "professional certifications", "credentials", "skill certifications", "certificates"],
+    "projects": ["projects", "personal projects", "academic projects", "project experience"],
+    "achievements": ["achievements", "accomplishments", "awards", "honors", "recognition"],
+    "summary": ["summary", "profile", "objective", "professional summary"]
 }
+SECTION_HEADER_PATTERN = re.compile('|'.join(re.escape(header) for headers in SECTION_HEADERS.values() for header in headers))
+SECTION_PATTERNS = [(section, re.compile('|'.join(re.escape(header) for header in headers))) for section, headers in SECTION_HEADERS.items()]
+EDUCATION_DATE_PATTERN = re.compile(r'\b(?:\d{4}\s*-\s*(?:\d{4}|Present)|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{2,4})\b')
+DEGREE_KEYWORDS = ("b.tech", "m.tech", "ph.d", "b.sc", "m.sc", "mba", "b.a", "m.a", "bachelor", "master", "associate", "doctorate", "higher secondary", "secondary")
+# A new education entry starts at a line with a date range or a degree keyword
+EDUCATION_ENTRY_PATTERN = re.compile(EDUCATION_DATE_PATTERN.pattern + '|' + '|'.join(re.escape(keyword) for keyword in DEGREE_KEYWORDS))
+
+parse_cache = resume_cache.ResumeCache(
+    resume_cache.fingerprint(skill_db, (PARSER_VERSION, skill_normalizer.source, app.config['NER_FALLBACK'], app.config['OCR_ENABLED'])),
+    max_bytes=app.config['RESUME_CACHE_MAX_BYTES'],
+    db_path=app.config['RESUME_CACHE_DB']
+)
+
+# The SpaCy model is only needed for the NER fallback in extract_name, so it is
+# imported and loaded on first use with every component except NER left out.
+SPACY_MODEL = "en_core_web_sm"
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    global nlp
+    if nlp is None:
+        with _nlp_lock:
+            if nlp is None:
+                import spacy
+                try:
+                    nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+                except OSError:
+                    spacy.cli.download(SPACY_MODEL)
+                    nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    return nlp
 
 # Utility Functions
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-@contextmanager
-def file_handler(file_path):
-    try:
-        yield file_path
-    finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+def iter_pdf_pages(source):
+    # source may be a path or a binary file-like object; pages are extracted
+    # one at a time as the caller consumes them and yielded as (page number,
+    # text). Pages without a text layer (scans) are held back and OCR'd
+    # together after the last page, so they are yielded last.
+    blank = []
+    for i, page in enumerate(PdfReader(source).pages):
+        text = page.extract_text() or ''
+        if text.strip() or not app.config['OCR_ENABLED']:
+            yield i, text
+        else:
+            blank.append((i, page))
+    if blank:
+        with metrics.stage_timer('ocr'):
+            texts = ocr.ocr_pages([page for _, page in blank])
+        yield from zip([i for i, _ in blank], texts)
 
-def parse_pdf(file_path):
+@timed('extract_pdf')
+def parse_pdf(source):
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            return ''.join(page.extract_text() or '' for page in pdf_reader.pages)
+        return ''.join(text for _, text in sorted(iter_pdf_pages(source)))
     except Exception as e:
-        print(f"Error parsing PDF: {e}")
+        logger.error(f"Error parsing PDF: {e}")
+        metrics.record_error('extract_pdf')
         return ""
 
-def parse_docx(file_path):
+@timed('extract_docx')
+def parse_docx(source):
     try:
-        doc = Document(file_path)
+        doc = Document(source)
         return '\n'.join(paragraph.text for paragraph in doc.paragraphs)
     except Exception as e:
-        print(f"Error parsing DOCX: {e}")
+        logger.error(f"Error parsing DOCX: {e}")
+        metrics.record_error('extract_docx')
         return ""
 
+def extract_document_text(filename, stream):
+    return parse_pdf(stream) if filename.lower().endswith('.pdf') else parse_docx(stream)
+
+@timed('extract_name')
 def extract_name(text):
     lines = text.split('\n')
     for line in lines[:3]:
@@ -85,12 +146,16 @@ def extract_name(text):
         parts = line.split()
         if 1 <= len(parts) <= 3 and not any(part.lower() in {"resume", "cv", "curriculum"} for part in parts):
             return line
-    doc = nlp(text[:500])
+    if not app.config['NER_FALLBACK']:
+        return "Unknown"
+    with metrics.stage_timer('ner'):
+        doc = get_nlp()(text[:500])
     for ent in doc.ents:
         if ent.label_ == 'PERSON':
             return ent.text
     return "Unknown"
 
+@timed('contact_info')
 def extract_contact_info(text):
     email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
     phone_pattern = r'(?<!\d)(?:\+?\d{1,3}[-.\s]?)?\(?(?:\d{3})?\)?[-.\s]?\d{3}[-.\s]?\d{4}(?!\d)'
@@ -98,34 +163,19 @@ def extract_contact_info(text):
     phones = [''.join(filter(str.isdigit, phone)) for phone in re.findall(phone_pattern, text) if 10 <= len(phone) <= 15]
     return emails, phones
 
-def identify_section_boundaries(lines):
-    section_headers = {
-        "contact": ["contact information", "contact", "personal information"],
-        "skills": ["skills", "technical skills", "core competencies", "expertise", "proficiencies"],
-        "experience": ["experience", "work experience", "professional experience", "employment history", "work history"],
-        "education": ["education", "academic background", "academic history", "educational background"],
-        "certifications": ["certifications", "professional certifications", "credentials", "skill certifications", "certificates"],
-        "projects": ["projects", "personal projects", "academic projects", "project experience"],
-        "achievements": ["achievements", "accomplishments", "awards", "honors", "recognition"],
-        "summary": ["summary", "profile", "objective", "professional summary"]
-    }
-    section_boundaries = {}
-    current_section = None
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        for section, headers in section_headers.items():
-            if any(header in line_lower for header in headers):
-                if current_section:
-                    section_boundaries[current_section]["end"] = i
-                current_section = section
-                section_boundaries[current_section] = {"start": i + 1, "end": len(lines)}
-    if current_section:
-        section_boundaries[current_section]["end"] = len(lines)
-    return section_boundaries
+def _header_sections(line_lower):
+    # Most lines contain no header at all and are rejected by one regex scan;
+    # otherwise every section with a matching header is returned, in
+    # SECTION_HEADERS order.
+    if not SECTION_HEADER_PATTERN.search(line_lower):
+        return []
+    return [section for section, pattern in SECTION_PATTERNS if pattern.search(line_lower)]
 
+@timed('skill_matching')
 def extract_skills_from_text(text):
-    return [skill for skill in skill_db if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE)]
+    return skill_normalizer.find_all(text)
 
+@timed('date_info')
 def extract_date_info(text):
     date_pattern = r'\b(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{2}|\d{4}|Present)\b'
     date_range_pattern = r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{2,4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?|\d{4})\s*[-–]\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{2,4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?|\d{4}|Present)\b'
@@ -135,35 +185,40 @@ def extract_date_info(text):
     date_match = re.search(date_pattern, text, re.IGNORECASE)
     return (date_match.group(0).strip(), "") if date_match else ("", "")
 
-def extract_section_content(lines, section_boundaries, section_name):
-    if section_name not in section_boundaries:
-        return []
-    start, end = section_boundaries[section_name]["start"], section_boundaries[section_name]["end"]
-    content, entry = [], []
-    for i in range(start, end):
-        line = lines[i].strip()
-        if section_name == "education":
-            date_pattern = r'\b(?:\d{4}\s*-\s*(?:\d{4}|Present)|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{2,4})\b'
-            degree_keywords = ["b.tech", "m.tech", "ph.d", "b.sc", "m.sc", "mba", "b.a", "m.a", "bachelor", "master", "associate", "doctorate", "higher secondary", "secondary"]
-            if (re.search(date_pattern, line.lower()) or any(keyword in line.lower() for keyword in degree_keywords)) and entry:
+@timed('segmentation')
+def segment_sections(lines):
+    # Splits the resume into sections and their blank-line separated entries
+    # in a single pass. A header line starts its section afresh, so when a
+    # header repeats only its last occurrence is kept; when a line matches
+    # several sections, only the last one receives the following lines.
+    sections = {}
+    current, content, entry = None, None, []
+    for line in lines:
+        line = line.strip()
+        line_lower = line.lower()
+        matched = _header_sections(line_lower)
+        if matched:
+            if entry:
                 content.append(entry)
-                entry = [line]
-            elif not line:
-                if entry:
-                    content.append(entry)
-                entry = []
-            else:
-                entry.append(line)
+            for section in matched:
+                sections[section] = []
+            current, content, entry = matched[-1], sections[matched[-1]], []
+            continue
+        if current is None:
+            continue
+        if current == "education" and entry and EDUCATION_ENTRY_PATTERN.search(line_lower):
+            content.append(entry)
+            entry = [line]
+        elif not line:
+            if entry:
+                content.append(entry)
+            entry = []
         else:
-            if not line:
-                if entry:
-                    content.append(entry)
-                entry = []
-            else:
-                entry.append(line)
+            entry.append(line)
     if entry:
         content.append(entry)
-    return content
+    return sections
+
 def parse_education(education_entries):
     formatted_education = []
     degree_patterns = [
@@ -189,14 +244,14 @@ def parse_education(education_entries):
         else:
             institution = lines[0].strip() if lines else "Institution not specified"
         description = " ".join(lines[2:]).strip() if len(lines) > 2 else ""
-        formatted_education.append({
-            "id": idx,
-            "degree": degree or "Degree not specified",
-            "institution": institution or "Institution not specified",
-            "start_date": start_date,
-            "end_date": end_date,
-            "description": description
-        })
+        formatted_education.append(EducationEntry(
+            id=idx,
+            degree=degree or "Degree not specified",
+            institution=institution or "Institution not specified",
+            start_date=start_date,
+            end_date=end_date,
+            description=description
+        ))
     return formatted_education
 
 def parse_experience(experience_entries):
@@ -225,15 +280,15 @@ def parse_experience(experience_entries):
             company = lines[1].strip() if len(lines) >= 2 else "Company not specified"
         description = " ".join(line for line in lines if line.strip() and line.strip() not in {title, company}).strip()
         skills = extract_skills_from_text(description)
-        formatted_experience.append({
-            "id": idx,
-            "title": title or "Position not specified",
-            "company": company or "Company not specified",
-            "start_date": start_date,
-            "end_date": end_date,
-            "description": description,
-            "skills": skills
-        })
+        formatted_experience.append(ExperienceEntry(
+            id=idx,
+            title=title or "Position not specified",
+            company=company or "Company not specified",
+            start_date=start_date,
+            end_date=end_date,
+            description=description,
+            skills=skills
+        ))
     return formatted_experience
 
 def parse_projects(project_entries):
@@ -244,12 +299,12 @@ def parse_projects(project_entries):
         name = lines[0].strip() if lines else "Project not specified"
         description = " ".join(lines[1:]).strip() if len(lines) > 1 else ""
         technologies = extract_skills_from_text(description)
-        formatted_projects.append({
-            "id": idx,
-            "name": name,
-            "description": description,
-            "technologies": technologies
-        })
+        formatted_projects.append(ProjectEntry(
+            id=idx,
+            name=name,
+            description=description,
+            technologies=technologies
+        ))
     return formatted_projects
 
 def parse_certifications(certification_entries):
@@ -262,24 +317,25 @@ def parse_certifications(certification_entries):
         issuer = issuer_match.group(1).strip() if issuer_match else None
         name = name.replace(issuer_match.group(0), "").strip() if issuer_match else name
         name = name.replace(date, "").strip() if date else name
-        formatted_certifications.append({
-            "id": idx,
-            "name": name or "Certification not specified",
-            "date": date,
-            "issuer": issuer
-        })
+        formatted_certifications.append(CertificationEntry(
+            id=idx,
+            name=name or "Certification not specified",
+            date=date,
+            issuer=issuer
+        ))
     return formatted_certifications
 
+@timed('parse_resume')
 def parse_resume(text):
     lines = [line.strip() for line in text.split('\n')]
-    section_boundaries = identify_section_boundaries(lines)
-    skills_section = extract_section_content(lines, section_boundaries, "skills")
-    experience_section = extract_section_content(lines, section_boundaries, "experience")
-    education_section = extract_section_content(lines, section_boundaries, "education")
-    certification_section = extract_section_content(lines, section_boundaries, "certifications")
-    project_section = extract_section_content(lines, section_boundaries, "projects")
-    achievement_section = extract_section_content(lines, section_boundaries, "achievements")
-    summary_section = extract_section_content(lines, section_boundaries, "summary")
+    sections = segment_sections(lines)
+    skills_section = sections.get("skills", [])
+    experience_section = sections.get("experience", [])
+    education_section = sections.get("education", [])
+    certification_section = sections.get("certifications", [])
+    project_section = sections.get("projects", [])
+    achievement_section = sections.get("achievements", [])
+    summary_section = sections.get("summary", [])
     skills_content = [item for sublist in skills_section for item in sublist]
     experience_content = experience_section
     education_content = education_section
@@ -293,9 +349,9 @@ def parse_resume(text):
     formatted_projects = parse_projects(project_content)
     formatted_certifications = parse_certifications(certification_content)
     for exp in formatted_experience:
-        skills.extend(skill for skill in exp.get("skills", []) if skill not in skills)
+        skills.extend(skill for skill in exp.skills if skill not in skills)
     for proj in formatted_projects:
-        skills.extend(tech for tech in proj.get("technologies", []) if tech not in skills)
+        skills.extend(tech for tech in proj.technologies if tech not in skills)
     return {
         "skills": skills,
         "experience": formatted_experience,
@@ -306,6 +362,113 @@ def parse_resume(text):
         "summary": summary_content
     }
 
+RESUME_FIELDS = ('name', 'emails', 'phone_numbers', 'skills', 'education', 'experience', 'projects',
+                 'certifications', 'matched_jobs', 'summary', 'parsedText')
+
+def iter_resume_data(text):
+    # (field, value) pairs in RESUME_FIELDS order, each as soon as it is known
+    yield 'name', extract_name(text)
+    emails, phones = extract_contact_info(text)
+    yield 'emails', emails
+    yield 'phone_numbers', phones
+    parsed_data = parse_resume(text)
+    yield 'skills', parsed_data['skills']
+    yield 'education', [entry.to_dict() for entry in parsed_data['education']]
+    yield 'experience', [entry.to_dict() for entry in parsed_data['experience']]
+    yield 'projects', [entry.to_dict() for entry in parsed_data['projects']]
+    yield 'certifications', [entry.to_dict() for entry in parsed_data['certifications']]
+    yield 'matched_jobs', []
+    yield 'summary', parsed_data['summary']
+    yield 'parsedText', text
+
+def build_resume_data(text):
+    return dict(iter_resume_data(text))
+
+def parse_resume_text(text, cache_key):
+    cached = parse_cache.get(cache_key)
+    if cached is not None:
+        return cached, True
+    response_data = build_resume_data(text)
+    parse_cache.put(cache_key, response_data)
+    return response_data, False
+
+analyzer = ResumeAnalyzer(skill_normalizer, parse_resume_text, max_profiles=app.config['ANALYZE_MAX_PROFILES'])
+
+def requested_fields():
+    # ?fields=name,skills (also a form field, or a list in a JSON body) keeps
+    # only those keys of each parsed resume; None keeps all of them
+    fields = request.args.get('fields') or request.form.get('fields')
+    if fields is None:
+        data = request.get_json(silent=True)
+        fields = data.get('fields') if isinstance(data, dict) else None
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    fields = [field.strip() for field in fields if isinstance(field, str) and field.strip()]
+    unknown = [field for field in fields if field not in RESUME_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {', '.join(unknown)}; choose from {', '.join(RESUME_FIELDS)}")
+    return fields or None
+
+def project_fields(data, fields):
+    return data if fields is None else {field: data[field] for field in fields if field in data}
+
+def project_result(result, fields):
+    return dict(result, data=project_fields(result['data'], fields)) if result.get('success') else result
+
+def wants_ndjson():
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+def ndjson_response(lines):
+    # One JSON document per line, each sent as soon as it is produced
+    return Response(stream_with_context(app.json.dumps(line) + '\n' for line in lines), mimetype='application/x-ndjson')
+
+def stream_resume(sections, fields, cached, cache_key=None):
+    # NDJSON for one resume: a status line, then one {field: value} line per
+    # section as it is ready, so the name and contact details arrive before
+    # the slower sections and the parsed text comes last. A fresh parse is
+    # cached once every section is done.
+    yield {'success': True, 'cached': cached}
+    data = {}
+    try:
+        for field, value in sections:
+            data[field] = value
+            if fields is None or field in fields:
+                yield {field: value}
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        yield {'success': False, 'error': f'Processing error: {str(e)}'}
+        return
+    if cache_key is not None:
+        parse_cache.put(cache_key, data)
+
+def batch_workers(data):
+    # How many of a batch's resumes may parse at once: an integer from the
+    # query string or JSON body, clamped to the pool's BATCH_WORKERS
+    value = request.args.get('workers') or data.get('workers')
+    if value is None or value == '':
+        return app.config['BATCH_WORKERS']
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('workers must be an integer')
+    return min(max(workers, 1), app.config['BATCH_WORKERS'])
+
+
+def stream_batch(items, workers, fields):
+    # NDJSON: one result line per resume in the order they finish, each with
+    # its input index
+    try:
+        for result in batch_parser.iter_batch(items, workers=app.config['BATCH_WORKERS'], cache=parse_cache,
+                                              max_in_flight=workers):
+            yield project_result(result, fields)
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        yield {'success': False, 'error': f'Processing error: {str(e)}'}
+
 # Flask Routes
 @app.route('/')
 def index():
@@ -321,32 +484,30 @@ def upload_file():
     if not allowed_file(file.filename):
         return jsonify({'error': 'File type not allowed'}), 400
     filename = secure_filename(file.filename)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     try:
-        file.save(file_path)
-        with file_handler(file_path) as fp:
-            text = parse_pdf(fp) if filename.endswith('.pdf') else parse_docx(fp)
-            if not text.strip():
-                return jsonify({'error': 'Empty or unreadable file'}), 400
-            name = extract_name(text)
-            emails, phones = extract_contact_info(text)
-            parsed_data = parse_resume(text)
-            response_data = {
-                'name': name,
-                'emails': emails,
-                'phone_numbers': phones,
-                'skills': parsed_data['skills'],
-                'education': parsed_data['education'],
-                'experience': parsed_data['experience'],
-                'projects': parsed_data['projects'],
-                'certifications': parsed_data['certifications'],
-                'matched_jobs': [],
-                'summary': parsed_data['summary'],
-                'parsedText': text
-            }
-            return jsonify({'success': True, 'data': response_data})
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        cache_key = resume_cache.stream_key(file.stream)
+        cached = parse_cache.get(cache_key)
+        if request.args.get('async') in ('1', 'true'):
+            return submit_async_job(filename, file, cache_key, cached)
+        stream = wants_ndjson()
+        if cached is not None:
+            if stream:
+                return ndjson_response(stream_resume(cached.items(), fields, True))
+            return jsonify({'success': True, 'cached': True, 'data': project_fields(cached, fields)})
+        text = extract_document_text(filename, file.stream)
+        if not text.strip():
+            return jsonify({'error': 'Empty or unreadable file'}), 400
+        if stream:
+            return ndjson_response(stream_resume(iter_resume_data(text), fields, False, cache_key))
+        response_data = build_resume_data(text)
+        parse_cache.put(cache_key, response_data)
+        return jsonify({'success': True, 'cached': False, 'data': project_fields(response_data, fields)})
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception(f"Error: {e}")
         return jsonify({'error': f'Processing error: {str(e)}'}), 500
 @app.route('/parse-text', methods=['POST'])
 def parse_text():
@@ -357,27 +518,189 @@ def parse_text():
     text = data['resume']
     if not text.strip():
         return jsonify({'error': 'Empty resume text'}), 400
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     try:
-        name = extract_name(text)
-        emails, phones = extract_contact_info(text)
-        parsed_data = parse_resume(text)
-        response_data = {
-            'name': name,
-            'emails': emails,
-            'phone_numbers': phones,
-            'skills': parsed_data['skills'],
-            'education': parsed_data['education'],
-            'experience': parsed_data['experience'],
-            'projects': parsed_data['projects'],
-            'certifications': parsed_data['certifications'],
-            'matched_jobs': [],
-            'summary': parsed_data['summary'],
-            'parsedText': text
-        }
-        return jsonify({'success': True, 'data': response_data})
+        cache_key = resume_cache.text_key(text)
+        if wants_ndjson():
+            cached = parse_cache.get(cache_key)
+            if cached is not None:
+                return ndjson_response(stream_resume(cached.items(), fields, True))
+            return ndjson_response(stream_resume(iter_resume_data(text), fields, False, cache_key))
+        response_data, cached = parse_resume_text(text, cache_key)
+        return jsonify({'success': True, 'cached': cached, 'data': project_fields(response_data, fields)})
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return jsonify({'error': f'Processing error: {str(e)}'}), 500
+@app.route('/parse-batch', methods=['POST'])
+def parse_batch():
+    items = [(secure_filename(file.filename), file.read()) for file in request.files.getlist('resumes') if file and file.filename]
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    texts = data.get('resumes', [])
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify({'error': 'resumes must be a list of resume texts'}), 400
+    items.extend(texts)
+    if not items:
+        return jsonify({'error': 'No resumes provided'}), 400
+    try:
+        workers = batch_workers(data)
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if wants_ndjson():
+        return ndjson_response(stream_batch(items, workers, fields))
+    try:
+        results = batch_parser.parse_batch(items, workers=app.config['BATCH_WORKERS'], cache=parse_cache,
+                                           max_in_flight=workers)
+        return jsonify({'success': True, 'results': [project_result(result, fields) for result in results]})
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return jsonify({'error': f'Processing error: {str(e)}'}), 500
+
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    # Called by the browser extension for every job page it sees; the resume
+    # is parsed once per content hash and only the job description is new work
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    resume_text = data.get('resume')
+    job_description = data.get('jobDescription')
+    if not isinstance(resume_text, str) or not resume_text.strip():
+        return jsonify({'error': 'No resume text provided'}), 400
+    if not isinstance(job_description, str) or not job_description.strip():
+        return jsonify({'error': 'No job description provided'}), 400
+    try:
+        result = analyzer.analyze(resume_text, job_description, resume_cache.text_key(resume_text))
+        return jsonify({'success': True, **result})
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception(f"Error: {e}")
         return jsonify({'error': f'Processing error: {str(e)}'}), 500
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify(parse_cache.stats())
+
+_async_queue = None
+_async_queue_lock = threading.Lock()
+
+def get_async_queue():
+    # Created on first use: an in-process queue on the batch pool, or with
+    # ASYNC_QUEUE_DB set a SQLite-backed queue shared by all server processes
+    global _async_queue
+    with _async_queue_lock:
+        if _async_queue is None:
+            if app.config['ASYNC_QUEUE_DB']:
+                _async_queue = async_jobs.SqliteJobQueue(
+                    app.config['ASYNC_QUEUE_DB'],
+                    lambda item: batch_parser.submit_item(item, workers=app.config['BATCH_WORKERS']).result(),
+                    workers=app.config['BATCH_WORKERS'],
+                    max_pending=app.config['ASYNC_MAX_PENDING'],
+                    result_ttl=app.config['ASYNC_RESULT_TTL'],
+                    on_success=parse_cache.put
+                )
+            else:
+                _async_queue = async_jobs.InProcessJobQueue(
+                    lambda item: batch_parser.submit_item(item, workers=app.config['BATCH_WORKERS']),
+                    workers=app.config['BATCH_WORKERS'],
+                    max_pending=app.config['ASYNC_MAX_PENDING'],
+                    result_ttl=app.config['ASYNC_RESULT_TTL'],
+                    on_success=parse_cache.put
+                )
+        return _async_queue
+
+def submit_async_job(filename, file, cache_key, cached):
+    queue = get_async_queue()
+    if cached is not None:
+        job_id = queue.add_finished(filename, {'success': True, 'filename': filename, 'data': cached, 'cached': True})
+    else:
+        try:
+            job_id = queue.submit(filename, file.stream.read(), key=cache_key)
+        except async_jobs.QueueFull:
+            response = jsonify({'error': 'Too many pending jobs, retry later'})
+            response.headers['Retry-After'] = '5'
+            return response, 429
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': queue.get(job_id)['status'],
+        'status_url': f'/jobs/{job_id}',
+        'events_url': f'/jobs/{job_id}/events'
+    }), 202
+
+def async_job_body(job, fields=None):
+    body = {'job_id': job['job_id'], 'status': job['status'], 'filename': job['filename']}
+    result = job['result']
+    if result is not None:
+        body['success'] = result['success']
+        if result['success']:
+            body['cached'] = result.get('cached', False)
+            body['data'] = project_fields(result['data'], fields)
+        else:
+            body['error'] = result['error']
+    return body
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_async_job(job_id):
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    job = get_async_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(async_job_body(job, fields))
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_async_job(job_id):
+    # Server-sent events: one 'status' event per state change, ending with a
+    # 'result' event once the job is done or failed
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    queue = get_async_queue()
+    job = queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    def events(job):
+        deadline = time.monotonic() + app.config['ASYNC_EVENTS_TIMEOUT']
+        if job['status'] in async_jobs.PENDING_STATUSES:
+            yield f"event: status\ndata: {json.dumps(async_job_body(job))}\n\n"
+        while job['status'] in async_jobs.PENDING_STATUSES and time.monotonic() < deadline:
+            status = job['status']
+            job = queue.wait(job_id, status, timeout=15)
+            if job is None:
+                return
+            if job['status'] == status:
+                yield ': keep-alive\n\n'
+            elif job['status'] in async_jobs.PENDING_STATUSES:
+                yield f"event: status\ndata: {json.dumps(async_job_body(job))}\n\n"
+        if job['status'] not in async_jobs.PENDING_STATUSES:
+            yield f"event: result\ndata: {json.dumps(async_job_body(job, fields))}\n\n"
+
+    return Response(stream_with_context(events(job)), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+def _cache_gauges(cache):
+    def collect():
+        stats = cache.stats()
+        return {(name,): stats[name] for name in ('hits', 'misses', 'evictions', 'entries', 'bytes')}
+    return collect
+
+metrics.instrument_app(app, 'resume-parser')
+compression.compress_responses(app)
+metrics.REGISTRY.gauge('resume_cache', 'Parse cache counters and size.', ['field'], callback=_cache_gauges(parse_cache))
+metrics.REGISTRY.gauge('ocr_page_cache', 'OCR page cache counters and size.', ['field'], callback=_cache_gauges(ocr.page_cache))
+metrics.REGISTRY.gauge('batch_pool_workers', 'Processes in the batch parsing pool.', callback=batch_parser.pool_workers)
+metrics.REGISTRY.gauge('batch_items_in_flight', 'Batch items submitted and not yet finished.', callback=batch_parser.items_in_flight)
+metrics.REGISTRY.gauge('async_jobs_pending', 'Asynchronous parse jobs queued or running.',
+                       callback=lambda: _async_queue.pending() if _async_queue is not None else 0)
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,265 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = ('queued', 'running')
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _finished_status(result):
+    return 'done' if result.get('success') else 'failed'
+
+
+class InProcessJobQueue:
+    # Runs parse jobs on an executor in this process. Jobs wait here in
+    # submission order and at most workers of them are handed to the
+    # executor at a time; a job is 'running' from that moment. At most
+    # max_pending jobs may be queued or running; further submissions raise
+    # QueueFull so the caller can push back on the client. Finished records
+    # are kept for result_ttl seconds. on_success(key, data) is called with
+    # the key given at submission whenever a job succeeds.
+
+    def __init__(self, submit, workers=2, max_pending=64, result_ttl=600, on_success=None):
+        self._submit = submit
+        self.workers = workers
+        self.on_success = on_success
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._jobs = {}
+        self._waiting = deque()
+        self._running = 0
+        self._changed = threading.Condition()
+
+    def _prune(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['status'] not in PENDING_STATUSES and now - job['updated'] > self.result_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def pending(self):
+        with self._changed:
+            return sum(job['status'] in PENDING_STATUSES for job in self._jobs.values())
+
+    def submit(self, filename, payload, key=None):
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._changed:
+            self._prune(now)
+            if sum(job['status'] in PENDING_STATUSES for job in self._jobs.values()) >= self.max_pending:
+                raise QueueFull()
+            self._jobs[job_id] = {'job_id': job_id, 'status': 'queued', 'filename': filename,
+                                  'created': now, 'updated': now, 'result': None}
+            self._waiting.append((job_id, (filename, payload), key))
+        self._dispatch()
+        return job_id
+
+    def add_finished(self, filename, result):
+        # Records a job whose result was already known, e.g. from the cache
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._changed:
+            self._prune(now)
+            self._jobs[job_id] = {'job_id': job_id, 'status': _finished_status(result), 'filename': filename,
+                                  'created': now, 'updated': now, 'result': result}
+        return job_id
+
+    def _dispatch(self):
+        # Starts waiting jobs while fewer than workers are running
+        while True:
+            with self._changed:
+                if not self._waiting or self._running >= self.workers:
+                    return
+                job_id, item, key = self._waiting.popleft()
+                self._running += 1
+                self._jobs[job_id].update(status='running', updated=time.time())
+                self._changed.notify_all()
+            try:
+                future = self._submit(item)
+            except Exception as e:
+                logger.error(f"Error starting parse job: {e}")
+                self._complete(job_id, {'success': False, 'filename': item[0], 'error': f'Processing error: {str(e)}'})
+                continue
+            future.add_done_callback(lambda done, job_id=job_id, key=key: self._finish(job_id, done, key))
+
+    def _finish(self, job_id, future, key):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'success': False, 'error': f'Processing error: {str(e)}'}
+        if result.get('success') and self.on_success is not None:
+            try:
+                self.on_success(key, result['data'])
+            except Exception as e:
+                logger.error(f"Error storing parse job result: {e}")
+        self._complete(job_id, result)
+        self._dispatch()
+
+    def _complete(self, job_id, result):
+        with self._changed:
+            self._running -= 1
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(status=_finished_status(result), updated=time.time(), result=result)
+            self._changed.notify_all()
+
+    def get(self, job_id):
+        with self._changed:
+            self._prune(time.time())
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait(self, job_id, status, timeout):
+        # Blocks until the job leaves the given status or timeout elapses
+        with self._changed:
+            self._changed.wait_for(lambda: self._jobs.get(job_id, {}).get('status') != status, timeout)
+        return self.get(job_id)
+
+
+class SqliteJobQueue:
+    # A job queue in a local SQLite file, shared by every process that opens
+    # it: any process may accept a job, any process's dispatcher threads may
+    # run it and any process can answer status queries. Jobs stuck in
+    # 'running' for stale_after seconds (their process died) are retried.
+
+    def __init__(self, path, run_item, workers=2, max_pending=64, result_ttl=600, on_success=None,
+                 poll_interval=0.2, stale_after=600):
+        self.path = path
+        self.run_item = run_item
+        self.on_success = on_success
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._db().execute(
+            'CREATE TABLE IF NOT EXISTS parse_jobs (job_id TEXT PRIMARY KEY, status TEXT, filename TEXT, '
+            'payload BLOB, cache_key TEXT, result TEXT, created REAL, updated REAL)'
+        )
+        self._db().execute('CREATE INDEX IF NOT EXISTS parse_jobs_status ON parse_jobs (status, created)')
+        self._threads = [threading.Thread(target=self._dispatch, name=f'parse-dispatcher-{i}', daemon=True) for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+        return db
+
+    def pending(self):
+        return self._db().execute(
+            "SELECT COUNT(*) FROM parse_jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()[0]
+
+    def submit(self, filename, payload, key=None):
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute("DELETE FROM parse_jobs WHERE status IN ('done', 'failed') AND updated < ?", (now - self.result_ttl,))
+            if db.execute("SELECT COUNT(*) FROM parse_jobs WHERE status IN ('queued', 'running')").fetchone()[0] >= self.max_pending:
+                raise QueueFull()
+            db.execute('INSERT INTO parse_jobs VALUES (?, ?, ?, ?, ?, NULL, ?, ?)', (job_id, 'queued', filename, payload, key, now, now))
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def add_finished(self, filename, result):
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute("DELETE FROM parse_jobs WHERE status IN ('done', 'failed') AND updated < ?", (now - self.result_ttl,))
+            db.execute('INSERT INTO parse_jobs VALUES (?, ?, ?, NULL, NULL, ?, ?, ?)',
+                       (job_id, _finished_status(result), filename, json.dumps(result), now, now))
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def _claim(self):
+        db = self._db()
+        now = time.time()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute(
+                "SELECT job_id, filename, payload, cache_key FROM parse_jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND updated < ?) ORDER BY created LIMIT 1",
+                (now - self.stale_after,)
+            ).fetchone()
+            if row is not None:
+                db.execute("UPDATE parse_jobs SET status = 'running', updated = ? WHERE job_id = ?", (now, row[0]))
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return row
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            try:
+                row = self._claim()
+            except sqlite3.Error as e:
+                logger.error(f"Error claiming parse job: {e}")
+                row = None
+            if row is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            try:
+                self._run(*row)
+            except Exception as e:
+                # The job stays 'running' and is retried once it goes stale
+                logger.exception(f"Error finishing parse job {row[0]}: {e}")
+
+    def _run(self, job_id, filename, payload, key):
+        try:
+            result = self.run_item((filename, payload))
+        except Exception as e:
+            result = {'success': False, 'error': f'Processing error: {str(e)}'}
+        if result.get('success') and self.on_success is not None:
+            try:
+                self.on_success(key, result['data'])
+            except Exception as e:
+                logger.error(f"Error storing parse job result: {e}")
+        self._db().execute(
+            'UPDATE parse_jobs SET status = ?, result = ?, payload = NULL, updated = ? WHERE job_id = ?',
+            (_finished_status(result), json.dumps(result), time.time(), job_id)
+        )
+
+    def get(self, job_id):
+        row = self._db().execute(
+            'SELECT job_id, status, filename, created, updated, result FROM parse_jobs WHERE job_id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'job_id': row[0], 'status': row[1], 'filename': row[2], 'created': row[3], 'updated': row[4],
+                'result': json.loads(row[5]) if row[5] else None}
+
+    def wait(self, job_id, status, timeout):
+        deadline = time.monotonic() + timeout
+        job = self.get(job_id)
+        while job is not None and job['status'] == status and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            job = self.get(job_id)
+        return job
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
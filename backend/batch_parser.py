@@ -0,0 +1,187 @@
+import io
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import resume_cache
+
+DEFAULT_WORKERS = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def _init_worker():
+    # Load the spaCy model once per worker process, so every resume handled
+    # by this worker reuses it. Scanned pages are OCR'd in the worker itself.
+    import app
+    import ocr
+    if app.app.config['NER_FALLBACK']:
+        app.get_nlp()
+    ocr.run_inline()
+
+
+def _parse_item(item):
+    import app
+    filename, payload = item
+    try:
+        if filename is None:
+            text = payload
+        elif not app.allowed_file(filename):
+            return {'success': False, 'filename': filename, 'error': 'File type not allowed'}
+        else:
+            text = app.extract_document_text(filename, io.BytesIO(payload))
+        if not text or not text.strip():
+            return {'success': False, 'filename': filename, 'error': 'Empty or unreadable file'}
+        return {'success': True, 'filename': filename, 'data': app.build_resume_data(text)}
+    except Exception as e:
+        return {'success': False, 'filename': filename, 'error': f'Processing error: {str(e)}'}
+
+
+def get_pool(workers=None):
+    # One pool per process, shared by batches and async jobs. It is created
+    # with workers processes (BATCH_WORKERS by default) and only replaced
+    # once broken, never resized, since each new pool reloads spaCy.
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = workers or DEFAULT_WORKERS
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, initializer=_init_worker)
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def pool_workers():
+    return _pool_workers if _pool is not None else 0
+
+
+def items_in_flight():
+    return _in_flight
+
+
+def _track_in_flight(delta):
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def _submit(item, workers=None):
+    # Queues item on the shared pool. A pool found broken, at submission or
+    # when a worker dies under the item, is dropped so the next item gets a
+    # fresh one.
+    pool = get_pool(workers)
+    try:
+        future = pool.submit(_parse_item, item)
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        pool = get_pool(workers)
+        future = pool.submit(_parse_item, item)
+    _track_in_flight(1)
+    future.add_done_callback(lambda _: _track_in_flight(-1))
+    future.add_done_callback(lambda done: _reset_if_broken(pool, done))
+    return future
+
+
+def submit_item(item, workers=None):
+    # Queues one (filename, bytes) pair or text on the shared pool and
+    # returns its future; used by the asynchronous upload mode.
+    item = (None, item) if isinstance(item, str) else tuple(item)
+    return _submit(item, workers)
+
+
+def _reset_if_broken(pool, future):
+    if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+        _reset_pool(pool)
+
+
+def _cache_key(item):
+    filename, payload = item
+    return resume_cache.text_key(payload) if filename is None else resume_cache.file_key(payload)
+
+
+def iter_batch(items, workers=None, cache=None, max_in_flight=None):
+    # items are plain resume texts or (filename, bytes) pairs. Yields one
+    # success/error record per item, carrying its input index: cached items
+    # first, then the rest as they finish parsing. With a cache, only items
+    # not seen before are sent to the shared pool (created with workers
+    # processes), at most max_in_flight of them at a time.
+    items = [(None, item) if isinstance(item, str) else tuple(item) for item in items]
+    if not items:
+        return
+    keys = [_cache_key(item) for item in items] if cache is not None else [None] * len(items)
+    cached = [cache.get(key) if key else None for key in keys]
+    todo = deque(index for index, data in enumerate(cached) if data is None)
+    limit = max_in_flight or len(items)
+    # Items that were in flight when a worker died (e.g. a crash inside a PDF
+    # library). Once nothing else is running they are retried one at a time,
+    # so only the item that kills a worker on its own is reported as failed.
+    suspects = deque()
+    retried = set()
+    futures = {}
+
+    def fill():
+        if suspects:
+            if not futures:
+                index = suspects.popleft()
+                retried.add(index)
+                futures[_submit(items[index], workers)] = index
+            return
+        while todo and len(futures) < limit:
+            index = todo.popleft()
+            futures[_submit(items[index], workers)] = index
+
+    try:
+        fill()
+        for index, ((filename, _), data) in enumerate(zip(items, cached)):
+            if data is not None:
+                yield {'success': True, 'filename': filename, 'data': data, 'cached': True, 'index': index}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures.pop(future)
+                filename = items[index][0]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    if index not in retried:
+                        suspects.append(index)
+                        continue
+                    result = {'success': False, 'filename': filename, 'error': 'Worker process failed'}
+                except Exception as e:
+                    result = {'success': False, 'filename': filename, 'error': f'Processing error: {str(e)}'}
+                if result['success'] and keys[index]:
+                    cache.put(keys[index], result['data'])
+                result['cached'] = False
+                result['index'] = index
+                yield result
+            fill()
+    finally:
+        # Nothing is left queued behind a caller that stopped early
+        for future in futures:
+            future.cancel()
+
+
+def parse_batch(items, workers=None, cache=None, max_in_flight=None):
+    # Every record of iter_batch, in input order
+    return sorted(iter_batch(items, workers=workers, cache=cache, max_in_flight=max_in_flight),
+                  key=lambda result: result['index'])
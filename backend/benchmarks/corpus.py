@@ -0,0 +1,143 @@
+import io
+import random
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Carlos", "Amara", "Olga", "Kenji", "Fatima", "Liam"]
+LAST_NAMES = ["Doe", "Smith", "Sharma", "Zhang", "Garcia", "Okafor", "Ivanova", "Tanaka", "Khan", "Murphy"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli"]
+INSTITUTIONS = ["MIT", "Stanford University", "IIT Bombay", "University of Toronto", "ETH Zurich"]
+DEGREES = ["B.Tech in Computer Science", "M.Sc Data Science", "Bachelor of Arts in Economics", "MBA", "Ph.D in Physics"]
+TITLES = ["Software Engineer", "Senior Developer", "Data Analyst", "Product Manager", "DevOps Engineer", "Research Intern"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Remote", "Berlin", "Bangalore", "London"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "PostgreSQL", "MongoDB", "Docker",
+    "Kubernetes", "AWS", "Azure", "Machine Learning", "Deep Learning", "Data Analysis", "Git", "Linux", "GraphQL",
+    "CI/CD", "Agile Methodologies", "Scrum", "Tableau", "Power BI", "Flask", "Django", "Spark", "Hadoop",
+]
+FILLER = (
+    "led a cross functional team to deliver features on schedule while improving reliability and reducing costs "
+    "designed and maintained services used by thousands of customers and collaborated closely with stakeholders "
+    "wrote documentation mentored new hires and reviewed code to keep quality high across the organisation"
+).split()
+
+# Each layout is an ordered list of (section, header) pairs; the header text
+# varies so the segmenter sees the different spellings it has to handle.
+LAYOUTS = [
+    [("summary", "Summary"), ("skills", "Skills"), ("experience", "Experience"), ("education", "Education"), ("projects", "Projects")],
+    [("summary", "Professional Summary"), ("experience", "Work Experience"), ("projects", "Personal Projects"),
+     ("skills", "Technical Skills"), ("certifications", "Certifications"), ("education", "Education")],
+    [("education", "Academic Background"), ("experience", "Employment History"), ("projects", "Academic Projects"),
+     ("achievements", "Awards"), ("skills", "Core Competencies")],
+]
+
+
+def _sentence(rng, skills, words=14):
+    tokens = rng.sample(FILLER, min(words, len(FILLER)))
+    tokens.insert(rng.randrange(len(tokens) + 1), "using " + " and ".join(rng.sample(skills, 2)))
+    return " ".join(tokens).capitalize() + "."
+
+
+def _date_range(rng):
+    start = rng.randint(2005, 2020)
+    end = "Present" if rng.random() < 0.3 else str(rng.randint(start, 2024))
+    return f"{rng.choice(MONTHS)} {start} - {end}"
+
+
+def _section_lines(rng, section, entries):
+    lines = []
+    for _ in range(entries):
+        if section == "summary":
+            lines.append(_sentence(rng, SKILLS, 20))
+        elif section == "skills":
+            lines.append(", ".join(rng.sample(SKILLS, 8)))
+        elif section == "experience":
+            lines += [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}", _date_range(rng)]
+            lines += [_sentence(rng, SKILLS) for _ in range(rng.randint(2, 5))]
+        elif section == "education":
+            lines += [rng.choice(INSTITUTIONS), rng.choice(DEGREES), f"{rng.randint(2000, 2018)} - {rng.randint(2019, 2024)}"]
+        elif section == "projects":
+            lines += [f"Project {rng.randint(1, 999)}", _sentence(rng, SKILLS)]
+        elif section == "certifications":
+            lines.append(f"{rng.choice(SKILLS)} Certification by {rng.choice(COMPANIES)} {rng.choice(MONTHS)} {rng.randint(2015, 2024)}")
+        else:
+            lines.append(f"Recognised for {rng.choice(FILLER)} {rng.choice(FILLER)} in {rng.randint(2010, 2024)}")
+        lines.append("")
+    return lines
+
+
+def generate_resume_text(rng, scale=1):
+    # scale multiplies the number of entries per section; scale=1 is a one
+    # page resume, scale=20 is roughly a 20+ page academic CV.
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, f"{name.lower().replace(' ', '.')}@example.com | +1 ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}", ""]
+    for section, header in rng.choice(LAYOUTS):
+        lines.append(header)
+        entries = 1 if section in ("summary", "skills") else rng.randint(1, 3) * scale
+        lines += _section_lines(rng, section, entries)
+    return "\n".join(lines)
+
+
+def generate_resumes(count, scale=1, seed=0):
+    rng = random.Random(seed)
+    return [generate_resume_text(rng, scale) for _ in range(count)]
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace")
+
+
+def text_to_pdf(text, lines_per_page=50):
+    # Minimal uncompressed PDF with one Helvetica text object per page; enough
+    # for PdfReader.extract_text to recover the lines.
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 760 Td\n" + b"".join(b"(" + _pdf_escape(line) + b") Tj T*\n" for line in page) + b"ET"
+        kids.append(len(objects) + 1)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>".encode()
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def text_to_docx(text):
+    from docx import Document
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def generate_jobs(count, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, rng.randint(3, 7))
+        jobs.append({
+            "id": f"job-{i}",
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "salary": f"${rng.randint(60, 150)}K - ${rng.randint(151, 200)}K",
+            "description": " ".join(_sentence(rng, skills) for _ in range(rng.randint(2, 6))),
+            "requirements": ["3+ years experience", "Bachelor's degree"],
+            "postedDate": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "matchScore": 0.0,
+            "skills": skills,
+            "link": f"https://example.com/jobs/{i}",
+        })
+    return jobs
@@ -0,0 +1,159 @@
+"""Benchmarks for the resume parsing and job matching hot paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scales 1,20 --jobs 100,100000 --save-baseline bench.json
+    python -m benchmarks.run --baseline bench.json
+
+Every stage is timed on its own over a synthetic corpus and reported as p50 /
+p95 latency, throughput and peak traced memory. With --baseline the p50 of
+each stage is compared to a saved run and regressions beyond --threshold
+percent make the command exit with status 1.
+"""
+import argparse
+import gc
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import generate_jobs, generate_resumes, text_to_docx, text_to_pdf
+
+
+def measure(fn, inputs, repeat):
+    timings = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    fn(inputs[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        "throughput_per_s": len(timings) / sum(timings) if sum(timings) else float("inf"),
+        "peak_kb": peak / 1024,
+    }
+
+
+def measure_once(fn):
+    # For one-off stages such as index builds; the traced run is separate
+    # because tracemalloc slows allocation-heavy code down considerably.
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"calls": 1, "p50_ms": elapsed * 1000, "p95_ms": elapsed * 1000,
+                    "throughput_per_s": 1 / elapsed if elapsed else float("inf"), "peak_kb": peak / 1024}
+
+
+def resume_stages(results, resumes_per_scale, scales, repeat, seed):
+    import app
+
+    for scale in scales:
+        texts = generate_resumes(resumes_per_scale, scale=scale, seed=seed)
+        pdfs = [text_to_pdf(text) for text in texts]
+        docxs = [text_to_docx(text) for text in texts]
+        line_lists = [text.split("\n") for text in texts]
+        suffix = f"[scale={scale}]"
+        results["extract_pdf" + suffix] = measure(lambda data: app.parse_pdf(io.BytesIO(data)), pdfs, repeat)
+        results["extract_docx" + suffix] = measure(lambda data: app.parse_docx(io.BytesIO(data)), docxs, repeat)
+        results["contact_info" + suffix] = measure(app.extract_contact_info, texts, repeat)
+        results["segmentation" + suffix] = measure(app.segment_sections, line_lists, repeat)
+        results["skill_matching" + suffix] = measure(app.extract_skills_from_text, texts, repeat)
+        results["parse_resume" + suffix] = measure(app.parse_resume, texts, repeat)
+
+    import spacy
+    if not spacy.util.is_package(app.SPACY_MODEL):
+        print(f"skipping ner: spaCy model {app.SPACY_MODEL} is not installed", file=sys.stderr)
+        return
+    _, results["ner_model_load"] = measure_once(app.get_nlp)
+    texts = generate_resumes(resumes_per_scale, seed=seed)
+    results["ner"] = measure(lambda text: app.get_nlp()(text[:500]), texts, repeat)
+
+
+def job_stages(results, job_counts, queries, repeat, seed):
+    from job_db import JobDatabase
+    from job_index import JobIndex
+    from job_ranker import TfidfJobRanker
+
+    skill_queries = [query.split(", ") for query in queries]
+    for count in job_counts:
+        jobs = generate_jobs(count, seed=seed)
+        suffix = f"[jobs={count}]"
+        index, results["job_index_build" + suffix] = measure_once(lambda: JobIndex(jobs))
+        results["job_skill_match" + suffix] = measure(lambda skills: index.match_skills(skills), skill_queries, repeat)
+        ranker, results["tfidf_fit" + suffix] = measure_once(lambda: TfidfJobRanker(jobs))
+        results["tfidf_rank" + suffix] = measure(lambda query: ranker.rank(query), queries, repeat)
+        job_db = JobDatabase(":memory:")
+        _, results["job_db_upsert" + suffix] = measure_once(lambda: job_db.upsert(jobs))
+        results["job_db_search" + suffix] = measure(lambda skills: job_db.search(skills), skill_queries, repeat)
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'stage':40} {'baseline p50':>14} {'p50':>10} {'change':>9}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["p50_ms"]
+        change = (stats["p50_ms"] - before) / before * 100 if before else 0.0
+        flag = " REGRESSION" if change > threshold else ""
+        print(f"{name:40} {before:12.3f}ms {stats['p50_ms']:8.3f}ms {change:+8.1f}%{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--resumes", type=int, default=20, help="synthetic resumes per scale")
+    parser.add_argument("--scales", default="1,5,20", help="comma separated resume length multipliers")
+    parser.add_argument("--jobs", default="100,1000,10000", help="comma separated job corpus sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-resumes", action="store_true")
+    parser.add_argument("--skip-jobs", action="store_true")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=10.0, help="p50 regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if not args.skip_resumes:
+        resume_stages(results, args.resumes, [int(scale) for scale in args.scales.split(",")], args.repeat, args.seed)
+    if not args.skip_jobs:
+        queries = [", ".join(sorted(set(job["skills"]))) for job in generate_jobs(20, seed=args.seed + 1)]
+        job_stages(results, [int(count) for count in args.jobs.split(",")], queries, args.repeat, args.seed)
+
+    print(f"{'stage':40} {'calls':>6} {'p50':>10} {'p95':>10} {'ops/s':>10} {'peak':>10}")
+    for name, stats in results.items():
+        print(f"{name:40} {stats['calls']:6d} {stats['p50_ms']:8.3f}ms {stats['p95_ms']:8.3f}ms "
+              f"{stats['throughput_per_s']:10.1f} {stats['peak_kb']:8.0f}KB")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            if compare(results, json.load(f), args.threshold):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
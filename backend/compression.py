@@ -0,0 +1,88 @@
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson')
+
+
+class GzipCompressor:
+    # zlib in gzip framing behind the same process/flush/finish interface as
+    # brotli.Compressor
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def choose_encoding(accept_encodings):
+    # Brotli when it is installed and the client takes it, else gzip, else None
+    return accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+
+
+def _compressor(app, encoding):
+    if encoding == 'br':
+        return brotli.Compressor(quality=app.config['COMPRESS_BROTLI_QUALITY'])
+    return GzipCompressor(app.config['COMPRESS_GZIP_LEVEL'])
+
+
+def _compress_stream(compressor, chunks):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_responses(app):
+    # Compresses JSON and NDJSON responses for clients that accept it, with
+    # brotli when installed and gzip otherwise. Buffered responses under
+    # COMPRESS_MIN_SIZE bytes are sent as they are. Streamed responses are
+    # flushed after every chunk, so each NDJSON line still reaches the
+    # client as soon as it is written.
+    from flask import request
+
+    app.config.setdefault('COMPRESS_RESPONSES', os.environ.get('COMPRESS_RESPONSES', '1') != '0')
+    app.config.setdefault('COMPRESS_MIN_SIZE', int(os.environ.get('COMPRESS_MIN_SIZE', 1024)))
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', int(os.environ.get('COMPRESS_GZIP_LEVEL', 6)))
+    # Low brotli qualities compress about as well as gzip at a similar speed;
+    # the high ones are meant for static assets
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4)))
+
+    @app.after_request
+    def _compress(response):
+        if not app.config['COMPRESS_RESPONSES'] or response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 304) or 'Content-Encoding' in response.headers:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        if response.is_streamed:
+            response.response = _compress_stream(_compressor(app, encoding), response.response)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config['COMPRESS_MIN_SIZE']:
+                return response
+            compressor = _compressor(app, encoding)
+            response.set_data(compressor.process(data) + compressor.finish())
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,47 @@
+# gunicorn settings for wsgi:application; gunicorn picks this file up when
+# started from backend/, and every value below can be set from the environment.
+#
+# Sizing under load: parsing a resume is CPU bound and holds the GIL, so
+# parsing throughput grows with worker processes, not threads. Run about one
+# worker per core (WEB_CONCURRENCY) with a few threads each (GUNICORN_THREADS)
+# so a worker keeps answering cache hits, job queries and the long-lived
+# /jobs/<id>/events streams while another of its threads parses.
+#
+# /parse-batch and OCR start their own process pools inside each worker, so
+# keep WEB_CONCURRENCY * (BATCH_WORKERS + OCR_WORKERS) near the core count.
+# On 4 cores, for example:
+#
+#   WEB_CONCURRENCY=4 GUNICORN_THREADS=4 BATCH_WORKERS=1 OCR_WORKERS=1
+#
+# or, for a batch-heavy deployment, WEB_CONCURRENCY=2 BATCH_WORKERS=2.
+#
+# Each worker has its own in-memory caches, job snapshot and scraper refresh.
+# Set RESUME_CACHE_DB and ASYNC_QUEUE_DB (the job database, JOBS_DB, is
+# always a file) so parsed resumes and asynchronous jobs are shared between
+# workers.
+#
+# Metrics are per process too: /metrics (and /api/match-jobs/metrics) report
+# only the worker that answers the scrape, not the whole server. Run a single
+# worker where exact totals matter, or treat each scrape as a sample.
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+# Load the apps and the spaCy model once in the master; see wsgi.py
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Recycling workers bounds slow growth of per-worker caches; 0 disables it
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+
+def worker_exit(server, worker):
+    # Take the worker's batch and OCR process pools down with it
+    import batch_parser
+    import ocr
+    batch_parser.shutdown_pool()
+    ocr.shutdown_pool()
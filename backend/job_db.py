@@ -0,0 +1,175 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from job_index import match_score
+from records import as_job
+
+logger = logging.getLogger(__name__)
+
+FTS_TOKENIZER = "unicode61 tokenchars '+#'"
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS jobs (seq INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, title TEXT, company TEXT, "
+    "location TEXT, salary TEXT, description TEXT, requirements TEXT, posted_date TEXT, match_score REAL, "
+    "skills TEXT, link TEXT, first_seen REAL, last_seen REAL)",
+    "CREATE INDEX IF NOT EXISTS jobs_location ON jobs (location COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS jobs_company ON jobs (company COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS jobs_posted_date ON jobs (posted_date)",
+    "CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen)",
+    # "+" and "#" are word characters, so "C++" and "C#" stay whole tokens
+    # instead of both becoming "c"
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(title, description, skills, content='jobs', "
+    f"content_rowid='seq', tokenize=\"{FTS_TOKENIZER}\")",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts (rowid, title, description, skills) VALUES (new.seq, new.title, new.description, new.skills); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts (jobs_fts, rowid, title, description, skills) VALUES ('delete', old.seq, old.title, old.description, old.skills); END",
+    # Skills are derived from a listing's text, so they change when the skill
+    # tables do; the listing is then reindexed
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF skills ON jobs WHEN old.skills IS NOT new.skills BEGIN "
+    "INSERT INTO jobs_fts (jobs_fts, rowid, title, description, skills) VALUES ('delete', old.seq, old.title, old.description, old.skills); "
+    "INSERT INTO jobs_fts (rowid, title, description, skills) VALUES (new.seq, new.title, new.description, new.skills); END",
+]
+
+COLUMNS = "id, title, company, location, salary, description, requirements, posted_date, match_score, skills, link"
+
+
+def fts_phrase(text):
+    # One FTS5 phrase; the tokenizer splits "Node.js" into the phrase "node js"
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _row_to_dict(row):
+    return {
+        "id": row[0],
+        "title": row[1],
+        "company": row[2],
+        "location": row[3],
+        "salary": row[4],
+        "description": row[5],
+        "requirements": json.loads(row[6]),
+        "postedDate": row[7],
+        "matchScore": row[8],
+        "skills": json.loads(row[9]),
+        "link": row[10],
+    }
+
+
+class JobDatabase:
+    # Scraped jobs in a local SQLite file, keyed by the content hash in
+    # Job.id so a listing seen again keeps its id and first-seen details.
+    # Location, company and posted date are indexed for filtering, and title,
+    # description and skills are full-text indexed for skill search. Jobs
+    # missing from every ingest for retention seconds are deleted.
+
+    def __init__(self, path, retention=7 * 24 * 3600):
+        self.path = path
+        self.retention = retention
+        self._local = threading.local()
+        # The file is created, and its schema checked, on first use
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _create_schema(self, db):
+        row = db.execute("SELECT sql FROM sqlite_master WHERE name = 'jobs_fts'").fetchone()
+        stale_fts = row is not None and FTS_TOKENIZER not in row[0]
+        if stale_fts:
+            db.execute("DROP TABLE jobs_fts")
+        for statement in SCHEMA:
+            db.execute(statement)
+        if stale_fts:
+            # Built with an older tokenizer; reindex the stored jobs
+            db.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    self._create_schema(db)
+                    self._ready = True
+        return db
+
+    def close(self):
+        # Closes this thread's connection; the next query reopens it
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def empty(self):
+        return self._db().execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is None
+
+    def upsert(self, jobs):
+        now = time.time()
+        rows = []
+        for job in jobs:
+            job = as_job(job)
+            rows.append((job.id, job.title, job.company, job.location, job.salary, job.description,
+                         json.dumps(list(job.requirements)), job.posted_date, job.match_score,
+                         json.dumps(job.skills), job.link, now, now))
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                f"INSERT INTO jobs ({COLUMNS}, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET last_seen = excluded.last_seen, skills = excluded.skills",
+                rows
+            )
+            pruned = db.execute("DELETE FROM jobs WHERE last_seen < ?", (now - self.retention,)).rowcount
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        logger.info(f"Stored {len(rows)} jobs, pruned {pruned}")
+        return len(rows)
+
+    def search(self, skills=(), location=None, company=None, posted_after=None, limit=5, offset=0):
+        # With skills, jobs are ranked by how many of them match in the
+        # full-text index; without, the newest postings come first. Returns
+        # one page of job dicts and whether more rows follow it.
+        filters, params = [], []
+        if location:
+            filters.append("jobs.location = ? COLLATE NOCASE")
+            params.append(location)
+        if company:
+            filters.append("jobs.company = ? COLLATE NOCASE")
+            params.append(company)
+        if posted_after:
+            filters.append("jobs.posted_date >= ?")
+            params.append(posted_after)
+        where = " AND ".join(filters)
+        columns = ", ".join(f"jobs.{column}" for column in COLUMNS.split(", "))
+        db = self._db()
+        skills = [skill for skill in dict.fromkeys(skill.strip().lower() for skill in skills) if skill]
+        if not skills:
+            rows = db.execute(
+                f"SELECT {columns} FROM jobs WHERE {where or 1} ORDER BY jobs.posted_date DESC, jobs.seq LIMIT ? OFFSET ?",
+                params + [limit + 1, offset]
+            ).fetchall()
+            return [_row_to_dict(row) for row in rows[:limit]], len(rows) > limit
+        # Count matching skills per job over the full-text hits alone and only
+        # then load the rows of the requested page
+        hits = " UNION ALL ".join("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?" for _ in skills)
+        restrict = f"WHERE hits.rowid IN (SELECT seq FROM jobs WHERE {where})" if where else ""
+        ranked = db.execute(
+            f"SELECT hits.rowid, COUNT(*) AS matched FROM ({hits}) AS hits {restrict} "
+            "GROUP BY hits.rowid ORDER BY matched DESC, hits.rowid LIMIT ? OFFSET ?",
+            [fts_phrase(skill) for skill in skills] + params + [limit + 1, offset]
+        ).fetchall()
+        page = ranked[:limit]
+        placeholders = ", ".join("?" for _ in page)
+        rows = {row[0]: row[1:] for row in db.execute(
+            f"SELECT jobs.seq, {columns} FROM jobs WHERE jobs.seq IN ({placeholders})", [seq for seq, _ in page]
+        )}
+        jobs = [dict(_row_to_dict(rows[seq]), matchScore=match_score(matched)) for seq, matched in page if seq in rows]
+        return jobs, len(ranked) > limit
@@ -0,0 +1,41 @@
+import numpy as np
+
+from job_store import JobStore
+from records import as_job, skill_vocabulary
+
+
+def match_score(matched_count):
+    return min(0.95, 0.6 + (matched_count * 0.1))
+
+
+class JobIndex:
+    # Built once per ingest of job listings: the jobs in columnar form, with
+    # their skills as a bitset matrix for skill-overlap matching. Substring
+    # and full-text search go through the job database instead.
+
+    def __init__(self, jobs=()):
+        self.jobs = JobStore()
+        self.add_jobs(jobs)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add_jobs(self, jobs):
+        for job in jobs:
+            self.jobs.append(as_job(job))
+
+    def match_skills(self, skills, limit=5):
+        # Scores jobs by how many of their own listed skills are in skills;
+        # the most overlapping jobs come first, ties in listing order.
+        if limit <= 0:
+            return []
+        # A skill no job lists cannot add to any overlap
+        overlap = self.jobs.skill_overlap(skill_vocabulary.bits(skills, add=False))
+        candidates = np.flatnonzero(overlap)
+        if len(candidates) > limit:
+            kth = np.partition(overlap[candidates], -limit)[-limit]
+            above = candidates[overlap[candidates] > kth]
+            ties = candidates[overlap[candidates] == kth][:limit - len(above)]
+            candidates = np.concatenate([above, ties])
+        top = sorted(candidates.tolist(), key=lambda job_id: (-overlap[job_id], job_id))
+        return [self.jobs.to_dict(job_id, matchScore=match_score(int(overlap[job_id]))) for job_id in top]
@@ -0,0 +1,44 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from records import as_job
+
+
+def job_document(job):
+    return " ".join([job.title, job.description, " ".join(job.skills)])
+
+
+class TfidfJobRanker:
+    # Fits a TF-IDF model over the job corpus once and keeps the L2-normalised
+    # document matrix, so ranking a resume is a single sparse matrix-vector
+    # product. A ranker is never modified after it is built: the job
+    # refresher fits a new one for every new job index and publishes it with
+    # that index's snapshot.
+
+    def __init__(self, jobs=(), **vectorizer_options):
+        self.jobs = [as_job(job) for job in jobs]
+        self.vectorizer = None
+        self.matrix = None
+        if not self.jobs:
+            return
+        vectorizer = TfidfVectorizer(**{"sublinear_tf": True, "stop_words": "english", **vectorizer_options})
+        try:
+            matrix = vectorizer.fit_transform([job_document(job) for job in self.jobs])
+        except ValueError:
+            # Every document was empty or made of stop words
+            return
+        self.vectorizer, self.matrix = vectorizer, matrix.tocsr()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def rank(self, query, limit=5):
+        # Returns (Job record, cosine similarity) pairs for the best matching jobs.
+        if self.vectorizer is None or limit <= 0 or not query.strip():
+            return []
+        scores = (self.matrix @ self.vectorizer.transform([query]).T).toarray().ravel()
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = sorted(candidates, key=lambda job_id: (-scores[job_id], job_id))
+        return [(self.jobs[job_id], float(scores[job_id])) for job_id in candidates]
@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import metrics
+from job_index import JobIndex
+from job_sources import registered_sources
+
+logger = logging.getLogger(__name__)
+
+# What was last ingested from one source, kept so an unchanged or failed
+# fetch can reuse the previously parsed jobs. digest is None until the source
+# has been fetched once; until then jobs holds its parse(None) fallback.
+SourceState = namedtuple("SourceState", ["jobs", "etag", "last_modified", "digest"])
+
+# Published to readers as a whole and never modified afterwards; a refresh
+# builds a new snapshot and swaps the reference. ranker is None unless the
+# refresher was given build_ranker.
+JobSnapshot = namedtuple("JobSnapshot", ["index", "ranker", "fetched_at", "sources"])
+
+
+class JobRefresher:
+    # Fetches and parses listings off the request path. Readers get the
+    # current snapshot immediately; once it is older than ttl a revalidation
+    # is started in the background and the stale snapshot is served until it
+    # finishes. A background thread also refreshes every interval seconds.
+    # on_change(snapshot) is called whenever a refresh produced new jobs, and
+    # build_ranker(jobs) fits the ranker published with each new index.
+
+    def __init__(self, fetcher, sources=registered_sources, ttl=300, interval=None, on_change=None, build_ranker=None):
+        self.fetcher = fetcher
+        self.sources = sources
+        self.on_change = on_change
+        self.build_ranker = build_ranker
+        self.ttl = ttl
+        self.interval = interval or ttl
+        self._snapshot = None
+        self._refresh_lock = threading.RLock()
+        self._revalidate_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load_source(self, source, state):
+        with metrics.stage_timer("job_fetch"):
+            page = self.fetcher.fetch(source, state.etag if state else None, state.last_modified if state else None)
+        if page is None:
+            # Keep serving what we have; the next refresh retries
+            return state or SourceState(source.parse(None), None, None, None)
+        if page.not_modified and state is not None:
+            logger.debug(f"{source.name} job listings not modified")
+            return state
+        digest = hashlib.sha256(page.html.encode("utf-8")).hexdigest()
+        if state is not None and digest == state.digest:
+            return state._replace(etag=page.etag, last_modified=page.last_modified)
+        with metrics.stage_timer("job_parse"):
+            jobs = source.parse(page.html)
+        return SourceState(jobs, page.etag, page.last_modified, digest)
+
+    def refresh(self):
+        # Each source is fetched and parsed in the fetcher's pool; the index is
+        # only rebuilt when at least one source produced new jobs.
+        with self._refresh_lock:
+            previous = self._snapshot
+            previous_states = previous.sources if previous else {}
+            sources = self.sources()
+            loaded = self.fetcher.map(lambda source: self._load_source(source, previous_states.get(source.name)), sources)
+            states = {source.name: state for source, state in zip(sources, loaded)}
+            now = time.monotonic()
+            unchanged = previous is not None and states.keys() == previous_states.keys() and all(
+                states[name].jobs is previous_states[name].jobs for name in states
+            )
+            if unchanged:
+                snapshot = previous._replace(fetched_at=now, sources=states)
+            else:
+                with metrics.stage_timer("job_index_build"):
+                    index = JobIndex(job for state in states.values() for job in state.jobs)
+                logger.info(f"Indexed {len(index)} jobs from {len(states)} sources")
+                snapshot = JobSnapshot(index, self._build_ranker(index), now, states)
+                if self.on_change is not None:
+                    try:
+                        self.on_change(snapshot)
+                    except Exception as e:
+                        logger.error(f"Error handling refreshed job listings: {e}")
+            self._snapshot = snapshot
+            return snapshot
+
+    def _build_ranker(self, index):
+        if self.build_ranker is None:
+            return None
+        try:
+            with metrics.stage_timer("tfidf_fit"):
+                return self.build_ranker(index.jobs.records())
+        except Exception as e:
+            logger.error(f"Error building the job ranker: {e}")
+            return None
+
+    @property
+    def snapshot(self):
+        # The current snapshot without triggering a fetch; None before the
+        # first refresh.
+        return self._snapshot
+
+    def _revalidate(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing job listings: {e}")
+        finally:
+            self._revalidate_lock.release()
+
+    def get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.start()
+            with self._refresh_lock:
+                return self._snapshot or self.refresh()
+        if time.monotonic() - snapshot.fetched_at > self.ttl and self._revalidate_lock.acquire(blocking=False):
+            threading.Thread(target=self._revalidate, daemon=True).start()
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing job listings: {e}")
+
+    def start(self):
+        with self._refresh_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="job-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+# What a fetch returns: the body (None when the server answered 304 Not
+# Modified) plus the validators to send with the next conditional request.
+FetchResult = namedtuple("FetchResult", ["html", "etag", "last_modified", "not_modified"])
+
+# A job board: where to fetch it and how to turn its HTML into job dicts.
+# parse(None) is called when the board has never been fetched successfully
+# and returns whatever fallback listings the board has (usually none).
+JobSource = namedtuple("JobSource", ["name", "url", "parse", "headers", "min_interval"])
+
+_sources = {}
+
+
+def register_source(name, url, parse, headers=None, min_interval=1.0):
+    source = JobSource(name, url, parse, {**DEFAULT_HEADERS, **(headers or {})}, min_interval)
+    _sources[name] = source
+    return source
+
+
+def registered_sources():
+    return list(_sources.values())
+
+
+def make_soup(html):
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+class HostRateLimiter:
+    # Spaces out requests to the same host by at least min_interval seconds.
+
+    def __init__(self):
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host, min_interval):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SourceFetcher:
+    # Fetches job boards concurrently over one pooled, retrying HTTP session,
+    # so ingesting several boards takes about as long as the slowest one.
+
+    def __init__(self, max_workers=8, timeout=10, retries=3, backoff_factor=0.5):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"}),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.rate_limiter = HostRateLimiter()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-source")
+
+    def fetch(self, source, etag=None, last_modified=None):
+        headers = dict(source.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        self.rate_limiter.wait(urlsplit(source.url).netloc, source.min_interval)
+        try:
+            logger.info(f"Fetching {source.name} job listings from: {source.url}")
+            response = self.session.get(source.url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                return FetchResult(None, etag, last_modified, True)
+            response.raise_for_status()
+            return FetchResult(response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"), False)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching {source.name} jobs: {e}")
+            metrics.record_error("job_fetch")
+            return None
+
+    def map(self, fn, items):
+        return list(self.executor.map(fn, items))
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,67 @@
+from array import array
+
+import numpy as np
+
+from records import Job, as_job, skill_vocabulary
+
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class JobStore:
+    # Jobs held column-wise: one list (or typed array) per field instead of
+    # one object per job, so 100k jobs cost a few pointers each on top of the
+    # strings themselves. Records and JSON dicts are only built for the rows
+    # a response actually returns.
+
+    def __init__(self, jobs=()):
+        self._columns = {name: [] for name in Job.__slots__}
+        self._columns["match_score"] = array("d")
+        self._skill_matrix = None
+        self.extend(jobs)
+
+    def __len__(self):
+        return len(self._columns["id"])
+
+    def append(self, job):
+        job = as_job(job)
+        for name, column in self._columns.items():
+            column.append(getattr(job, name))
+        self._skill_matrix = None
+
+    def extend(self, jobs):
+        for job in jobs:
+            self.append(job)
+
+    def column(self, name):
+        return self._columns[name]
+
+    def record(self, job_id):
+        return Job(*(column[job_id] for column in self._columns.values()))
+
+    def records(self):
+        return (self.record(job_id) for job_id in range(len(self)))
+
+    def to_dict(self, job_id, **overrides):
+        return dict(self.record(job_id).to_dict(), **overrides)
+
+    def skill_matrix(self):
+        # Skill bitsets as rows of 64-bit words, rebuilt after appends or once
+        # the vocabulary has outgrown the current width
+        words = max(1, (len(skill_vocabulary) + 63) // 64)
+        matrix = self._skill_matrix
+        if matrix is None or matrix.shape[1] != words:
+            as_bytes = b"".join(bits.to_bytes(words * 8, "little") for bits in self._columns["skill_bits"])
+            matrix = np.frombuffer(as_bytes, dtype="<u8").reshape(len(self), words)
+            self._skill_matrix = matrix
+        return matrix
+
+    def skill_overlap(self, bits):
+        # Number of skills each job shares with the bitset: AND against every
+        # row at once, then a byte-wise popcount.
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        matrix = self.skill_matrix()
+        # Skills no stored job can have are dropped to fit the matrix width
+        bits &= (1 << (matrix.shape[1] * 64)) - 1
+        query = np.frombuffer(bits.to_bytes(matrix.shape[1] * 8, "little"), dtype="<u8")
+        return POPCOUNT[(matrix & query).view(np.uint8)].reshape(len(self), -1).sum(axis=1, dtype=np.int64)
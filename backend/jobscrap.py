@@ -1,52 +1,66 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import requests
-from bs4 import BeautifulSoup
+import os
 import logging
-import uuid
 from datetime import datetime, timedelta
 import random
+import time
+import compression
+import metrics
+import skill_tables
+from job_db import JobDatabase
+from job_ranker import TfidfJobRanker
+from job_refresher import JobRefresher
+from job_sources import SourceFetcher, make_soup, register_source
+from records import Job, job_content_id, skill_vocabulary
 
 app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:5173"}})  # Restrict CORS to frontend origin
+# Restrict CORS to the frontend origin. The matcher answers on "/", which is
+# also where it sits when wsgi.py mounts it under /api/match-jobs
+CORS(app, resources={r"/": {"origins": "http://localhost:5173"}, r"/api/*": {"origins": "http://localhost:5173"}})
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-def fetch_joblistopia_jobs():
-    url = "https://joblistopia.lovable.app/"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-    }
-    try:
-        logger.info(f"Fetching Joblistopia job listings from: {url}")
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        logger.error(f"Error fetching Joblistopia jobs: {e}")
-        return None
+JOBLISTOPIA_URL = os.environ.get("JOBLISTOPIA_URL", "https://joblistopia.lovable.app/")
+JOBS_TTL = float(os.environ.get("JOBS_TTL", 300))
+JOBS_REFRESH_INTERVAL = float(os.environ.get("JOBS_REFRESH_INTERVAL", JOBS_TTL))
+SCRAPER_WORKERS = int(os.environ.get("SCRAPER_WORKERS", 8))
+# Next to this file rather than in whatever directory the server starts in
+JOBS_DB = os.environ.get("JOBS_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.db"))
+JOBS_RETENTION = float(os.environ.get("JOBS_RETENTION", 7 * 24 * 3600))
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 100))
+
+source_fetcher = SourceFetcher(max_workers=SCRAPER_WORKERS)
+job_db = JobDatabase(JOBS_DB, retention=JOBS_RETENTION)
+skill_normalizer = skill_tables.get_normalizer()
+
+# The board does not expose these per job yet; every card shares one copy
+PLACEHOLDER_REQUIREMENTS = ("3+ years experience", "Bachelor's degree", "Strong communication skills")
 
 def parse_joblistopia_jobs(html):
     if not html:
         logger.warning("No HTML content to parse, using mock data")
+        title, company, location = "Senior Frontend Developer", "TechGlobe Inc.", "San Francisco, CA"
+        description = "We are looking for an experienced Frontend Developer to join our team. The ideal candidate should have a strong understanding of Python, React, TypeScript, and modern frontend development practices."
+        link = "https://joblistopia.lovable.app/job1"
         return [
-            {
-                "id": str(uuid.uuid4()),
-                "title": "Senior Frontend Developer",
-                "company": "TechGlobe Inc.",
-                "location": "San Francisco, CA",
-                "salary": "$120,000 - $150,000",
-                "description": "We are looking for an experienced Frontend Developer to join our team. The ideal candidate should have a strong understanding of Python, React, TypeScript, and modern frontend development practices.",
-                "requirements": ["5+ years of experience in frontend development", "Strong proficiency in React, TypeScript, and modern JavaScript"],
-                "postedDate": "2023-09-15",
-                "matchScore": 0.8,
-                "skills": ["Python", "React", "TypeScript", "CSS", "HTML", "JavaScript"],
-                "link": "https://joblistopia.lovable.app/job1"
-            }
+            Job(
+                id=job_content_id(title, company, location, description, link),
+                title=title,
+                company=company,
+                location=location,
+                salary="$120,000 - $150,000",
+                description=description,
+                requirements=("5+ years of experience in frontend development", "Strong proficiency in React, TypeScript, and modern JavaScript"),
+                posted_date="2023-09-15",
+                match_score=0.8,
+                skill_bits=skill_vocabulary.bits(["Python", "React", "TypeScript", "CSS", "HTML", "JavaScript"]),
+                link=link
+            )
         ]
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     results = []
     job_cards = soup.select("div[class*='job'], li[class*='job'], article[class*='job']")
     logger.debug(f"Found {len(job_cards)} job cards in HTML")
@@ -61,64 +75,146 @@ def parse_joblistopia_jobs(html):
             link_elem = card.find("a")
             link = "https://joblistopia.lovable.app/" + link_elem["href"] if link_elem and "href" in link_elem.attrs and not link_elem["href"].startswith("http") else link_elem.get("href", "No link")
 
-            job_id = str(uuid.uuid4())
+            job_id = job_content_id(title, company, location, description, link)
             salary = f"${random.randint(60, 150)}K - ${random.randint(151, 200)}K"
-            requirements = ["3+ years experience", "Bachelor's degree", "Strong communication skills"]
             posted_date = (datetime.now() - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d")
             match_score = random.uniform(0.6, 0.95)
-            skills = ["Python", "JavaScript", "React", "SQL", "AWS"]
-
-            results.append({
-                "id": job_id,
-                "title": title,
-                "company": company,
-                "location": location,
-                "salary": salary,
-                "description": description,
-                "requirements": requirements,
-                "postedDate": posted_date,
-                "matchScore": match_score,
-                "skills": skills,
-                "link": link
-            })
+
+            results.append(Job(
+                id=job_id,
+                title=title,
+                company=company,
+                location=location,
+                salary=salary,
+                description=description,
+                requirements=PLACEHOLDER_REQUIREMENTS,
+                posted_date=posted_date,
+                match_score=match_score,
+                skill_bits=skill_vocabulary.bits(skill_normalizer.find_all(f"{title}\n{description}")),
+                link=link
+            ))
         except Exception as e:
             logger.error(f"Error parsing job card: {e}")
             continue
     
     return results
 
+joblistopia_source = register_source("joblistopia", JOBLISTOPIA_URL, parse_joblistopia_jobs)
+
+def store_snapshot(snapshot):
+    # Only jobs parsed from a fetched page are stored; a board's fallback
+    # listings are served while it has never answered, but never persisted
+    jobs = [job for state in snapshot.sources.values() if state.digest is not None for job in state.jobs]
+    with metrics.stage_timer("job_store"):
+        job_db.upsert(jobs)
+
+# The TF-IDF model is fitted by the refresher for every new index and
+# published with it, so requests never fit one themselves
+job_refresher = JobRefresher(source_fetcher, ttl=JOBS_TTL, interval=JOBS_REFRESH_INTERVAL, on_change=store_snapshot,
+                             build_ranker=TfidfJobRanker)
+
+def load_job_snapshot():
+    # Requests only read the latest published snapshot; fetching, parsing
+    # and fitting happen in the refresher's background thread
+    return job_refresher.get_snapshot()
+
+def page_params(params):
+    limit = min(max(int(params.get("limit", 5)), 1), MAX_PAGE_SIZE)
+    offset = max(int(params.get("offset", 0)), 0)
+    return limit, offset
+
+def filter_jobs(jobs, location=None, company=None, posted_after=None):
+    # The job database's filters, for job dicts ranked in memory
+    if location:
+        jobs = [job for job in jobs if job["location"].lower() == location.lower()]
+    if company:
+        jobs = [job for job in jobs if job["company"].lower() == company.lower()]
+    if posted_after:
+        jobs = [job for job in jobs if job["postedDate"] >= posted_after]
+    return jobs
+
+def page_jobs(jobs, limit, offset):
+    return jobs[offset:offset + limit], len(jobs) > offset + limit
+
 @app.route('/', methods=['GET', 'POST'])
 def match_jobs():
     logger.info("Received request at /api/match-jobs")
-    
+
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    params = {**request.args.to_dict(), **data}
+    try:
+        limit, offset = page_params(params)
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    filters = {"location": params.get("location"), "company": params.get("company"), "posted_after": params.get("postedAfter")}
+    if not all(value is None or isinstance(value, str) for value in filters.values()):
+        return jsonify({"error": "location, company and postedAfter must be strings"}), 400
+
     if request.method == 'GET':
-        html = fetch_joblistopia_jobs()
-        all_jobs = parse_joblistopia_jobs(html)
-        return jsonify({"jobs": all_jobs[:5]})
-    
-    data = request.get_json()
+        # Makes sure the first ingest has populated the database
+        snapshot = load_job_snapshot()
+        if job_db.empty():
+            # Nothing stored yet, e.g. the board has never answered: list the
+            # snapshot's fallback jobs instead
+            jobs = filter_jobs([job.to_dict() for job in snapshot.index.jobs.records()], **filters)
+            jobs, has_more = page_jobs(jobs, limit, offset)
+        else:
+            with metrics.stage_timer("job_query"):
+                jobs, has_more = job_db.search(limit=limit, offset=offset, **filters)
+        return jsonify({"jobs": jobs, "limit": limit, "offset": offset, "hasMore": has_more})
+
     logger.debug(f"Request data: {data}")
 
     skills = data.get('skills', [])
+    resume = data.get('resume', '')
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        return jsonify({"error": "skills must be a list of strings"}), 400
+    if not isinstance(resume, str):
+        return jsonify({"error": "resume must be a string"}), 400
     if not skills:
         logger.warning("No skills provided in request")
         return jsonify({"error": "No skills provided"}), 400
 
+    # Canonical names, so "k8s" or "ReactJS" find the jobs listing Kubernetes or React
+    skills = skill_normalizer.normalize_all(skills)
     logger.debug(f"Received skills: {skills}")
 
-    html = fetch_joblistopia_jobs()
-    all_jobs = parse_joblistopia_jobs(html)
+    snapshot = load_job_snapshot()
+    mode = params.get('mode')
+    if mode in ('tfidf', 'skills') or job_db.empty():
+        # In-memory rankers over the current snapshot, which also holds a
+        # board's fallback jobs while nothing is stored. They page by ranking
+        # one row past the requested page, or every job when filters apply.
+        wanted = len(snapshot.index) if any(filters.values()) else offset + limit + 1
+        if mode == 'tfidf':
+            query = " ".join(skills + [resume])
+            with metrics.stage_timer("tfidf_rank"):
+                ranked = snapshot.ranker.rank(query, limit=wanted) if snapshot.ranker is not None else []
+            matched_jobs = [dict(job.to_dict(), matchScore=score) for job, score in ranked]
+        else:
+            with metrics.stage_timer("job_skill_match"):
+                matched_jobs = snapshot.index.match_skills(skills, limit=wanted)
+        matched_jobs, has_more = page_jobs(filter_jobs(matched_jobs, **filters), limit, offset)
+    else:
+        with metrics.stage_timer("job_query"):
+            matched_jobs, has_more = job_db.search(skills, limit=limit, offset=offset, **filters)
+    logger.info(f"Returning {len(matched_jobs)} matched jobs")
+    return jsonify({"jobs": matched_jobs, "limit": limit, "offset": offset, "hasMore": has_more})
 
-    matched_jobs = []
-    for job in all_jobs:
-        matched_skills = [skill for skill in skills if skill.lower() in job["description"].lower() or skill.lower() in job["title"].lower()]
-        if matched_skills:
-            job["matchScore"] = min(0.95, 0.6 + (len(matched_skills) * 0.1))
-            matched_jobs.append(job)
+def _snapshot_gauge(value):
+    def collect():
+        snapshot = job_refresher.snapshot
+        return value(snapshot) if snapshot is not None else {}
+    return collect
 
-    matched_jobs.sort(key=lambda x: x["matchScore"], reverse=True)  # Sort by match score
-    logger.info(f"Returning {len(matched_jobs)} matched jobs")
-    return jsonify({"jobs": matched_jobs[:5]})  # Return top 5 jobs
+metrics.instrument_app(app, "job-matcher")
+compression.compress_responses(app)
+metrics.REGISTRY.gauge("jobs_indexed", "Jobs in the current snapshot.", callback=_snapshot_gauge(lambda snapshot: len(snapshot.index)))
+metrics.REGISTRY.gauge("jobs_stored", "Jobs in the persistent job database.", callback=lambda: len(job_db))
+metrics.REGISTRY.gauge("job_snapshot_age_seconds", "Seconds since the job snapshot was last refreshed.",
+                       callback=_snapshot_gauge(lambda snapshot: time.monotonic() - snapshot.fetched_at))
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
@@ -0,0 +1,261 @@
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter as TallyCounter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {value}' for key, value in sorted(values.items())]
+
+
+class Gauge(_Metric):
+    # Either set explicitly or backed by a callback that is evaluated at
+    # scrape time and returns a number or a {label tuple: value} dict.
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+        self.callback = callback
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+        if self.callback is not None:
+            try:
+                produced = self.callback()
+            except Exception as e:
+                logger.error(f"Error collecting gauge {self.name}: {e}")
+                produced = {}
+            values.update(produced if isinstance(produced, dict) else {(): produced})
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {float(value)}' for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, [("le", bound)])} {cumulative}')
+            lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, [("le", "+Inf")])} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        return self._register(Gauge, name, documentation, labelnames, callback=callback)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram('stage_duration_seconds', 'Time spent in each processing stage.', ['stage'])
+STAGE_ERRORS = REGISTRY.counter('stage_errors_total', 'Errors raised or reported by each processing stage.', ['stage'])
+REQUEST_SECONDS = REGISTRY.histogram('http_request_duration_seconds', 'HTTP request latency.', ['service', 'endpoint', 'method', 'status'])
+
+
+@contextmanager
+def stage_timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def timed(stage):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_error(stage):
+    STAGE_ERRORS.inc(stage=stage)
+
+
+class StackSampler:
+    # Samples the stack of one thread every interval seconds from a helper
+    # thread and tallies the stacks in collapsed "outer;inner" form, which
+    # flamegraph tools read directly. Cheap enough to leave on for a single
+    # request, unlike a tracing profiler.
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = TallyCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def instrument_app(app, service):
+    # Adds request latency histograms, a Prometheus text /metrics endpoint and
+    # the opt-in profiler. With PROFILING enabled in the app config, a request
+    # carrying the X-Profile header is sampled and, if it took at least
+    # PROFILE_SLOW_SECONDS, its collapsed stacks are written to PROFILE_DIR.
+    from flask import Response, g, request
+
+    app.config.setdefault('PROFILING', os.environ.get('PROFILING', '0') == '1')
+    app.config.setdefault('PROFILE_DIR', os.environ.get('PROFILE_DIR', 'profiles'))
+    app.config.setdefault('PROFILE_SLOW_SECONDS', float(os.environ.get('PROFILE_SLOW_SECONDS', 0)))
+    app.config.setdefault('PROFILE_INTERVAL', float(os.environ.get('PROFILE_INTERVAL', 0.005)))
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_start = time.perf_counter()
+        if app.config['PROFILING'] and request.headers.get('X-Profile'):
+            g.profiler = StackSampler(threading.get_ident(), app.config['PROFILE_INTERVAL']).start()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('request_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(elapsed, service=service, endpoint=endpoint, method=request.method, status=response.status_code)
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            if elapsed >= app.config['PROFILE_SLOW_SECONDS']:
+                os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+                path = os.path.join(app.config['PROFILE_DIR'], f'{service}-{int(time.time() * 1000)}-{threading.get_ident()}.folded')
+                profiler.dump(path)
+                response.headers['X-Profile-Path'] = path
+                logger.info(f"Wrote profile of {request.method} {request.path} ({elapsed:.3f}s) to {path}")
+        return response
+
+    def metrics_view():
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    return app
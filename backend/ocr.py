@@ -0,0 +1,153 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+import resume_cache
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:
+    pytesseract = None
+
+logger = logging.getLogger(__name__)
+
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', min(4, os.cpu_count() or 1)))
+OCR_PAGE_TIMEOUT = float(os.environ.get('OCR_PAGE_TIMEOUT', 30))
+OCR_MAX_PAGES = int(os.environ.get('OCR_MAX_PAGES', 10))
+OCR_LANG = os.environ.get('OCR_LANG', 'eng')
+
+page_cache = resume_cache.ResumeCache(
+    resume_cache.fingerprint((), ('ocr', OCR_LANG)),
+    max_bytes=int(os.environ.get('OCR_CACHE_MAX_BYTES', 16 * 1024 * 1024)),
+    db_path=os.environ.get('OCR_CACHE_DB')
+)
+
+_available = None
+_inline = False
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def available():
+    # pytesseract only wraps the tesseract binary, so both must be present
+    global _available
+    if _available is None:
+        if pytesseract is None:
+            _available = False
+        else:
+            try:
+                pytesseract.get_tesseract_version()
+                _available = True
+            except Exception:
+                _available = False
+        if not _available:
+            logger.warning("Tesseract OCR is not available; image-only PDF pages will be skipped")
+    return _available
+
+
+def run_inline():
+    # Called in batch worker processes: the batch pool already spreads
+    # documents over processes, so pages are OCR'd in the worker itself.
+    global _inline
+    _inline = True
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def page_images(page):
+    # Scanned pages carry their content as embedded images
+    try:
+        return [image.data for image in page.images]
+    except Exception as e:
+        logger.error(f"Error extracting page images: {e}")
+        return []
+
+
+def ocr_images(images, lang, timeout):
+    # tesseract is killed once timeout elapses
+    texts = []
+    for data in images:
+        with Image.open(io.BytesIO(data)) as image:
+            text = pytesseract.image_to_string(image, lang=lang, timeout=timeout).strip()
+        if text:
+            texts.append(text + '\n')
+    return ''.join(texts)
+
+
+def ocr_pages(pages):
+    # Returns the OCR text of each page ('' where nothing could be read).
+    # Only the first OCR_MAX_PAGES pages with images are OCR'd, pages seen
+    # before are answered from page_cache and the rest run in parallel.
+    texts = [''] * len(pages)
+    if not pages or not available():
+        return texts
+    pending = []
+    for i, page in enumerate(pages):
+        images = page_images(page)
+        if not images:
+            continue
+        key = 'ocr:' + resume_cache.hash_bytes(b''.join(images))
+        cached = page_cache.get(key)
+        if cached is not None:
+            texts[i] = cached
+        elif len(pending) < OCR_MAX_PAGES:
+            pending.append((i, key, images))
+        else:
+            logger.warning(f"Skipping OCR of page {i + 1}: more than {OCR_MAX_PAGES} pages need OCR")
+    if not pending:
+        return texts
+    if _inline:
+        results = [_run(lambda images=images: ocr_images(images, OCR_LANG, OCR_PAGE_TIMEOUT)) for _, _, images in pending]
+    else:
+        pool = get_pool()
+        futures = [pool.submit(ocr_images, images, OCR_LANG, OCR_PAGE_TIMEOUT) for _, _, images in pending]
+        # The worker kills tesseract after OCR_PAGE_TIMEOUT; the grace period
+        # only covers image decoding and queueing behind other pages
+        results = [_run(lambda future=future: future.result(timeout=OCR_PAGE_TIMEOUT * 2)) for future in futures]
+    for (i, key, _), text in zip(pending, results):
+        if text is not None:
+            page_cache.put(key, text)
+            texts[i] = text
+    return texts
+
+
+def _run(fn):
+    try:
+        return fn()
+    except BrokenProcessPool:
+        logger.error("OCR worker process died; the pool is rebuilt for the next document")
+        _reset_pool()
+    except FutureTimeoutError:
+        logger.error("OCR of a page timed out")
+    except Exception as e:
+        logger.error(f"Error running OCR: {e}")
+    metrics.record_error('ocr')
+    return None
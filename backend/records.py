@@ -0,0 +1,163 @@
+import hashlib
+import sys
+import threading
+from dataclasses import dataclass
+
+
+class SkillVocabulary:
+    # Gives every skill name a bit position, matched case-insensitively, so a
+    # set of skills is one int and the overlap of two sets is a bitwise AND.
+    # Positions are only ever added, so existing bitsets stay valid. Names
+    # from requests are looked up with add=False, so they cannot grow it.
+
+    def __init__(self, skills=()):
+        self._names = []
+        self._ids = {}
+        self._lock = threading.Lock()
+        for skill in skills:
+            self.id(skill)
+
+    def __len__(self):
+        return len(self._names)
+
+    def id(self, skill, add=True):
+        # None for an unknown skill when add is False
+        key = skill.lower()
+        skill_id = self._ids.get(key)
+        if skill_id is None and add:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    skill_id = self._ids[key] = len(self._names)
+                    self._names.append(sys.intern(skill))
+        return skill_id
+
+    def bits(self, skills, add=True):
+        # With add=False, skills not in the vocabulary are left out
+        bits = 0
+        for skill in skills:
+            skill_id = self.id(skill, add)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+    def names(self, bits):
+        names = []
+        skill_id = 0
+        while bits:
+            if bits & 1:
+                names.append(self._names[skill_id])
+            bits >>= 1
+            skill_id += 1
+        return names
+
+
+# Process-wide vocabulary for job skills
+skill_vocabulary = SkillVocabulary()
+
+
+class Record:
+    __slots__ = ()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class Job(Record):
+    # Requirements are a tuple of interned strings and skills a bitset into
+    # skill_vocabulary, so jobs scraped from the same board share them.
+    id: str
+    title: str
+    company: str
+    location: str
+    salary: str
+    description: str
+    requirements: tuple
+    posted_date: str
+    match_score: float
+    skill_bits: int
+    link: str
+
+    @property
+    def skills(self):
+        return skill_vocabulary.names(self.skill_bits)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("id", ""),
+            data.get("title", ""),
+            data.get("company", ""),
+            data.get("location", ""),
+            data.get("salary", ""),
+            data.get("description", ""),
+            tuple(sys.intern(requirement) for requirement in data.get("requirements", ())),
+            data.get("postedDate", ""),
+            data.get("matchScore", 0.0),
+            skill_vocabulary.bits(data.get("skills", ())),
+            data.get("link", ""),
+        )
+
+    def to_dict(self):
+        # The JSON shape the frontend expects
+        return {
+            "id": self.id,
+            "title": self.title,
+            "company": self.company,
+            "location": self.location,
+            "salary": self.salary,
+            "description": self.description,
+            "requirements": list(self.requirements),
+            "postedDate": self.posted_date,
+            "matchScore": self.match_score,
+            "skills": self.skills,
+            "link": self.link,
+        }
+
+
+def job_content_id(title, company, location, description, link):
+    # Stable across scrapes of the same listing, unlike a random UUID
+    digest = hashlib.sha256("\0".join([title, company, location, description, link]).encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+def as_job(job):
+    return job if isinstance(job, Job) else Job.from_dict(job)
+
+
+@dataclass(slots=True)
+class ExperienceEntry(Record):
+    id: int
+    title: str
+    company: str
+    start_date: str
+    end_date: str
+    description: str
+    skills: list
+
+
+@dataclass(slots=True)
+class EducationEntry(Record):
+    id: int
+    degree: str
+    institution: str
+    start_date: str
+    end_date: str
+    description: str
+
+
+@dataclass(slots=True)
+class ProjectEntry(Record):
+    id: int
+    name: str
+    description: str
+    technologies: list
+
+
+@dataclass(slots=True)
+class CertificationEntry(Record):
+    id: int
+    name: str
+    date: str
+    issuer: str
@@ -0,0 +1,137 @@
+import datetime
+import functools
+import re
+import threading
+from collections import Counter, OrderedDict, namedtuple
+
+import metrics
+from records import skill_vocabulary
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+YEARS_PATTERN = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"\b((?:19|20)\d{2})\b|\b[A-Za-z]{3,9}\.?\s*'?(\d{2})\b")
+KEYWORD_LIMIT = 25
+
+# Words too common in job postings to say anything about fit
+STOP_WORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could do does
+each etc for from has have having he her his how if in into is it its job just may more most must
+new not of on or other our out over own per please plus role same she should so some such than that
+the their them then there these they this those through to under up us very via was we well were what
+when where which while who will with within work working would you your year years
+ability able apply candidate candidates company experience including join looking position preferred
+required requirements responsibilities skills strong team teams understanding knowledge opportunity
+""".split())
+
+# What is kept per resume: the parser's skills and their bitset, the resume
+# vocabulary and an estimate of years of experience.
+ResumeProfile = namedtuple("ResumeProfile", ["skills", "skill_bits", "tokens", "years"])
+
+# What is kept per job description; tuples so cached values stay immutable.
+JobProfile = namedtuple("JobProfile", ["skills", "skill_bits", "keywords", "required_years"])
+
+
+def _year(value, this_year):
+    if not value:
+        return None
+    if value.strip().lower() == "present":
+        return this_year
+    match = YEAR_PATTERN.search(value)
+    if match is None:
+        return None
+    return int(match.group(1)) if match.group(1) else 2000 + int(match.group(2))
+
+
+def experience_years(resume_data, text):
+    # The span between the earliest start and latest end date in the
+    # experience section, or a stated "N years" figure if that is larger.
+    this_year = datetime.date.today().year
+    starts, ends = [], []
+    for entry in resume_data.get("experience", []):
+        start = _year(entry.get("start_date"), this_year)
+        end = _year(entry.get("end_date"), this_year) or start
+        if start is not None:
+            starts.append(start)
+            ends.append(end)
+    span = max(0, max(ends) - min(starts)) if starts else 0
+    stated = [int(years) for years in YEARS_PATTERN.findall(text)]
+    return max([span] + stated)
+
+
+class ResumeAnalyzer:
+    # Compares one resume with job descriptions for the browser extension.
+    # The resume side is derived once per resume hash and kept in a small
+    # LRU, so repeat calls with the same resume only scan the (much shorter)
+    # job description, and recently seen job descriptions are memoized too.
+    # parse(text, key) returns the parsed resume dict and whether it came
+    # from a cache.
+
+    def __init__(self, matcher, parse, max_profiles=256):
+        self.matcher = matcher
+        self.parse = parse
+        self.max_profiles = max_profiles
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.job_profile = functools.lru_cache(maxsize=512)(self._job_profile)
+        # Every skill the matcher can report gets a bit up front; resumes and
+        # job descriptions are then only looked up in the vocabulary
+        skill_vocabulary.bits(matcher.canonical_skills())
+
+    def profile(self, text, key):
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                return profile, True
+        resume_data, cached = self.parse(text, key)
+        skills = tuple(resume_data.get("skills", []))
+        profile = ResumeProfile(
+            skills,
+            skill_vocabulary.bits(skills, add=False),
+            frozenset(TOKEN_PATTERN.findall(text.lower())),
+            experience_years(resume_data, text),
+        )
+        with self._lock:
+            self._profiles[key] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile, cached
+
+    def _job_profile(self, text):
+        with metrics.stage_timer("jd_analysis"):
+            skills = tuple(self.matcher.find_all(text))
+            counts = Counter(token for token in TOKEN_PATTERN.findall(text.lower())
+                             if len(token) > 2 and not token.isdigit() and token not in STOP_WORDS)
+            keywords = tuple(token for token, _ in counts.most_common(KEYWORD_LIMIT))
+            required = [int(years) for years in YEARS_PATTERN.findall(text)]
+            return JobProfile(skills, skill_vocabulary.bits(skills, add=False), keywords, max(required) if required else None)
+
+    def analyze(self, resume_text, job_description, key):
+        resume, cached = self.profile(resume_text, key)
+        job = self.job_profile(job_description)
+        matched_bits = job.skill_bits & resume.skill_bits
+        matched = [skill for skill in job.skills if matched_bits >> skill_vocabulary.id(skill, add=False) & 1]
+        missing = [skill for skill in job.skills if not matched_bits >> skill_vocabulary.id(skill, add=False) & 1]
+        keywords_match = round(100 * sum(token in resume.tokens for token in job.keywords) / len(job.keywords)) if job.keywords else 0
+        # Without any recognised skills in the posting, keyword overlap is the
+        # best available signal for the skills score as well
+        skills_match = round(100 * len(matched) / len(job.skills)) if job.skills else keywords_match
+        if job.required_years:
+            experience_match = min(100, round(100 * resume.years / job.required_years))
+        else:
+            experience_match = 100
+        overall = round(0.6 * skills_match + 0.2 * experience_match + 0.2 * keywords_match)
+        suggestions = [f"Add {skill} to your resume if you have worked with it." for skill in missing[:5]]
+        if job.required_years and resume.years < job.required_years:
+            suggestions.append(f"The posting asks for {job.required_years}+ years of experience; make the dates of your relevant roles explicit.")
+        return {
+            "cached": cached,
+            "score": overall,
+            "overallMatch": overall,
+            "skillsMatch": skills_match,
+            "experienceMatch": experience_match,
+            "keywordsMatch": keywords_match,
+            "matchedSkills": matched,
+            "missingSkills": missing,
+            "suggestions": suggestions,
+        }
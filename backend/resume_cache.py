@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_stream(stream, chunk_size=64 * 1024):
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def hash_text(text):
+    return hash_bytes(text.encode('utf-8', 'surrogatepass'))
+
+
+def file_key(data):
+    return 'file:' + hash_bytes(data)
+
+
+def stream_key(stream):
+    return 'file:' + hash_stream(stream)
+
+
+def text_key(text):
+    return 'text:' + hash_text(text)
+
+
+def fingerprint(skills, parser_version):
+    # Changes whenever the skill vocabulary or the parser version does, so
+    # entries produced by an older parser are never served.
+    digest = hashlib.sha256(str(parser_version).encode('utf-8'))
+    for skill in sorted(skills):
+        digest.update(b'\0' + skill.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class ResumeCache:
+    # LRU cache of parsed resumes keyed by content hash. Values are kept as
+    # serialized JSON so the memory bound is exact and callers always get a
+    # private copy. An optional SQLite file keeps entries across restarts and
+    # can be shared by server processes; it is only an optimization, so a
+    # failing read or write is logged and the request goes on without it.
+
+    def __init__(self, fingerprint, max_bytes=64 * 1024 * 1024, db_path=None):
+        self.fingerprint = fingerprint
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.db_path = db_path
+        self._db = None
+        if db_path:
+            db = self._connection()
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS resume_cache '
+                '(key TEXT PRIMARY KEY, fingerprint TEXT, value TEXT, created REAL)'
+            )
+            db.execute('DELETE FROM resume_cache WHERE fingerprint != ?', (fingerprint,))
+            db.commit()
+
+    def _connection(self):
+        if self._db is None:
+            # WAL lets workers read while another writes; writers wait for
+            # each other up to the timeout
+            db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            self._db = db
+        return self._db
+
+    def _load(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT value FROM resume_cache WHERE key = ? AND fingerprint = ?',
+                (key, self.fingerprint)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading the resume cache: {e}")
+            metrics.record_error('resume_cache')
+            return None
+        return row[0] if row else None
+
+    def _save(self, key, value):
+        try:
+            db = self._connection()
+            db.execute(
+                'INSERT OR REPLACE INTO resume_cache (key, fingerprint, value, created) VALUES (?, ?, ?, ?)',
+                (key, self.fingerprint, value, time.time())
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing the resume cache: {e}")
+            metrics.record_error('resume_cache')
+            if self._db is not None and self._db.in_transaction:
+                self._db.rollback()
+
+    def close(self):
+        # Closes the SQLite file until the next lookup reopens it, so a server
+        # can drop the connection before forking workers that must not share it
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            elif self.db_path:
+                value = self._load(key)
+                if value is not None:
+                    self._store(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, key, data):
+        value = json.dumps(data)
+        with self._lock:
+            self._store(key, value)
+            if self.db_path:
+                self._save(key, value)
+
+    def _store(self, key, value):
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self.db_path:
+                db = self._connection()
+                db.execute('DELETE FROM resume_cache')
+                db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'persistent': bool(self.db_path),
+                'fingerprint': self.fingerprint
+            }
@@ -0,0 +1,197 @@
+import functools
+import hashlib
+import json
+import re
+
+# Words, keeping the trailing "+" / "#" of C++, C# and F#
+TOKEN_PATTERN = re.compile(r"[^\W_]+[+#]*")
+# What may separate the tokens of one skill: "Node.js", "CI/CD", "Machine Learning".
+# Never a line break or a full stop followed by a space, so the end of one
+# sentence or line and the start of the next ("team.\n\nWork") are not joined.
+JOINER_PATTERN = re.compile(r"\.|[ \t]*(?:[/-][ \t]*)?")
+
+
+def skill_key(text):
+    return "".join(token.lower() for token in TOKEN_PATTERN.findall(text))
+
+
+# Bump whenever the index built from the same tables changes
+INDEX_VERSION = 2
+
+
+def index_source(skills, aliases, case_sensitive):
+    # Identifies the inputs an index was built from, so a prebuilt index
+    # file can be checked against the current skill tables
+    digest = hashlib.sha256(json.dumps([INDEX_VERSION, sorted(skills), sorted(aliases.items()), sorted(case_sensitive)]).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _deletions(key):
+    return {key} | {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _within_one_edit(a, b):
+    # Damerau-Levenshtein distance <= 1: one substitution, insertion,
+    # deletion or swap of adjacent characters
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1])
+
+
+class SkillNormalizer:
+    # Maps skill mentions to canonical skill names. Every canonical name and
+    # alias is reduced to a key (lowercase tokens joined without separators,
+    # so "Node.js", "NodeJS" and "node js" agree) and the text is scanned as
+    # runs of up to max_tokens tokens, longest run first; a run only grows
+    # while it spells the start of some key. Runs with no exact key are looked
+    # up within one edit through a deletion index when they are at least
+    # fuzzy_min_length characters long, so in a name of several words only
+    # the last may be misspelt. Short names that are
+    # also plain words (e.g. "Go") only match as written, in case_sensitive.
+    # Everything is precomputed, and the index can be saved to and loaded
+    # from a JSON file.
+
+    def __init__(self, skills=(), aliases=None, case_sensitive=(), fuzzy_min_length=8, source=None):
+        aliases = aliases or {}
+        self.source = source or index_source(skills, aliases, case_sensitive)
+        self.fuzzy_min_length = fuzzy_min_length
+        self._keys = {}
+        self._case_forms = {}
+        for name, canonical in list(aliases.items()) + [(skill, skill) for skill in skills]:
+            key = skill_key(name)
+            if not key:
+                continue
+            if name == canonical or key not in self._keys:
+                self._keys[key] = canonical
+            if name in case_sensitive:
+                self._case_forms.setdefault(key, []).append(name)
+        self._deletes = {}
+        for key in self._keys:
+            if len(key) >= fuzzy_min_length - 1 and key.isalpha() and key not in self._case_forms:
+                for variant in _deletions(key):
+                    self._deletes.setdefault(variant, []).append(key)
+        self.max_tokens = max((len(TOKEN_PATTERN.findall(name)) for name in list(aliases) + list(skills)), default=1)
+        self._prepare()
+
+    def _prepare(self):
+        # Most runs in a document are ordinary words, so fuzzy lookups are
+        # memoized and runs longer than any indexed key skip them outright
+        self._fuzzy_max_length = max(map(len, self._deletes), default=0) + 1
+        self._prefixes = {key[:i] for key in self._keys for i in range(1, len(key) + 1)}
+        self.fuzzy = functools.lru_cache(maxsize=65536)(self._fuzzy)
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "fuzzy_min_length": self.fuzzy_min_length,
+            "max_tokens": self.max_tokens,
+            "keys": self._keys,
+            "case_forms": self._case_forms,
+            "deletes": self._deletes,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        normalizer = cls(fuzzy_min_length=data["fuzzy_min_length"], source=data["source"])
+        normalizer.max_tokens = data["max_tokens"]
+        normalizer._keys = data["keys"]
+        normalizer._case_forms = data["case_forms"]
+        normalizer._deletes = data["deletes"]
+        normalizer._prepare()
+        return normalizer
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def _exact(self, key, surface):
+        canonical = self._keys.get(key)
+        if canonical is not None and key in self._case_forms and surface not in self._case_forms[key]:
+            return None
+        return canonical
+
+    def _fuzzy(self, key):
+        if not self.fuzzy_min_length <= len(key) <= self._fuzzy_max_length or not key.isalpha():
+            return None
+        best = None
+        for variant in _deletions(key):
+            for candidate in self._deletes.get(variant, ()):
+                if _within_one_edit(key, candidate) and (best is None or candidate < best):
+                    best = candidate
+        return self._keys[best] if best is not None else None
+
+    def _match_at(self, text, tokens, i):
+        # The longest mention starting at token i, as (canonical skill, index
+        # of its last token), or None
+        token = tokens[i][0]
+        if token not in self._prefixes:
+            # Starts no key, so at most a misspelt one-word skill
+            canonical = self.fuzzy(token)
+            return (canonical, i) if canonical is not None else None
+        runs = []
+        key = ""
+        for j in range(i, min(len(tokens), i + self.max_tokens)):
+            if j > i and not JOINER_PATTERN.fullmatch(text, tokens[j - 1][2], tokens[j][1]):
+                break
+            key += tokens[j][0]
+            runs.append((key, j))
+            if key not in self._prefixes:
+                break
+        for key, j in reversed(runs):
+            canonical = self._exact(key, text[tokens[i][1]:tokens[j][2]])
+            if canonical is not None:
+                return canonical, j
+        for key, j in reversed(runs):
+            canonical = self.fuzzy(key)
+            if canonical is not None:
+                return canonical, j
+        return None
+
+    def iter_matches(self, text):
+        # Yields (canonical skill, start, end) for every mention. Mentions may
+        # overlap ("Big Data Visualization" holds Big Data and Data
+        # Visualization), but one lying wholly inside an earlier mention, like
+        # the "js" of "Node.js", is not reported.
+        tokens = [(match.group().lower(), match.start(), match.end()) for match in TOKEN_PATTERN.finditer(text)]
+        covered = 0
+        for i in range(len(tokens)):
+            found = self._match_at(text, tokens, i)
+            if found is None:
+                continue
+            canonical, j = found
+            if tokens[j][2] > covered:
+                covered = tokens[j][2]
+                yield canonical, tokens[i][1], covered
+
+    def find_all(self, text):
+        found = {}
+        for skill, start, _ in self.iter_matches(text):
+            found.setdefault(skill, start)
+        return sorted(found, key=found.get)
+
+    def canonical_skills(self):
+        return sorted(set(self._keys.values()))
+
+    def normalize(self, skill):
+        # The canonical name for one skill as a user typed it, or None; a
+        # skill given on its own is not mistaken for a word, so case is ignored
+        key = skill_key(skill)
+        return self._keys.get(key) or self.fuzzy(key)
+
+    def normalize_all(self, skills):
+        # Canonical names where known, the input otherwise; duplicates dropped
+        return list(dict.fromkeys(self.normalize(skill) or skill.strip() for skill in skills if skill.strip()))
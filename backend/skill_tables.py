@@ -0,0 +1,88 @@
+import logging
+import os
+import threading
+
+from skill_normalizer import SkillNormalizer, index_source
+
+logger = logging.getLogger(__name__)
+
+# Skill Database (Extensive)
+SKILL_DB = {
+    "Microsoft Office", "Product Management", "Roadmap Planning", "Agile Methodologies",
+    "Data Analysis", "Market Research", "Business Analytics", "Wireframing",
+    "Prototyping", "SQL", "Python", "Strategic Thinking", "Stakeholder Management",
+    "Leadership", "Problem Solving", "Critical Thinking", "Adaptability", "Java",
+    "HTML", "CSS", "JavaScript", "Next.js", "MySQL", "MongoDB", "Git", "GitHub",
+    "Figma", "Koha", "PostgreSQL", "Firebase", "Unit Testing", "TypeScript", "SSR",
+    "Vercel", "OOPS", "Data Structures", "Algorithms", "Database Optimization",
+    "AWS", "Azure", "Docker", "Kubernetes", "CI/CD", "RESTful APIs", "GraphQL",
+    "Machine Learning", "Deep Learning", "Natural Language Processing", "Data Science",
+    "Statistical Analysis", "Communication Skills", "Teamwork", "Project Management",
+    "Scrum", "Kanban", "UI/UX Design", "Responsive Design", "Mobile Development",
+    "iOS Development", "Android Development", "React", "Angular", "Vue.js", "Node.js",
+    "Express.js", "Django", "Flask", "Ruby on Rails", "C++", "C#", "Go", "Swift",
+    "Kotlin", "PHP", "Bash Scripting", "PowerShell", "Linux", "Windows Server",
+    "Networking", "Cybersecurity", "Cloud Computing", "DevOps", "Big Data", "Spark",
+    "Hadoop", "Tableau", "Power BI", "Data Visualization", "Database Design", "SEO",
+    "Digital Marketing", "Social Media Marketing", "Content Creation", "Technical Writing",
+    "Negotiation", "Presentation Skills", "Mentoring", "Coaching", "Time Management",
+    "Budgeting", "Risk Management", "Compliance", "Auditing", "Process Improvement"
+}
+
+# Other ways the same skills are written, mapped to their canonical names
+SKILL_ALIASES = {
+    "JS": "JavaScript", "ECMAScript": "JavaScript", "ES6": "JavaScript",
+    "Postgres": "PostgreSQL", "Mongo": "MongoDB",
+    "k8s": "Kubernetes", "kube": "Kubernetes",
+    "ReactJS": "React", "Node": "Node.js", "NodeJS": "Node.js", "Golang": "Go",
+    "Vue": "Vue.js", "VueJS": "Vue.js", "AngularJS": "Angular", "ExpressJS": "Express.js", "NextJS": "Next.js",
+    "Python3": "Python", "CPP": "C++", "C Sharp": "C#",
+    "ML": "Machine Learning", "NLP": "Natural Language Processing",
+    "Amazon Web Services": "AWS", "Microsoft Azure": "Azure",
+    "CICD": "CI/CD", "Continuous Integration": "CI/CD", "Continuous Delivery": "CI/CD", "Continuous Deployment": "CI/CD",
+    "REST API": "RESTful APIs", "REST APIs": "RESTful APIs", "RESTful API": "RESTful APIs",
+    "UI/UX": "UI/UX Design", "UX Design": "UI/UX Design", "UI Design": "UI/UX Design",
+    "OOP": "OOPS", "Object Oriented Programming": "OOPS",
+    "Unit Tests": "Unit Testing", "MS Office": "Microsoft Office",
+    "Bash": "Bash Scripting", "Shell Scripting": "Bash Scripting",
+    "Agile": "Agile Methodologies", "Cyber Security": "Cybersecurity", "Information Security": "Cybersecurity",
+    "Search Engine Optimization": "SEO", "Apache Spark": "Spark", "Apache Hadoop": "Hadoop",
+    "Mobile App Development": "Mobile Development", "Data Visualisation": "Data Visualization",
+}
+
+# Names that are also everyday words and only count when capitalised as here
+CASE_SENSITIVE_SKILLS = {"Go", "Node"}
+
+# Optional prebuilt index; rebuilt and rewritten when the tables above change
+SKILL_INDEX_PATH = os.environ.get("SKILL_INDEX_PATH")
+
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+
+def load_normalizer(path=None):
+    source = index_source(SKILL_DB, SKILL_ALIASES, CASE_SENSITIVE_SKILLS)
+    if path and os.path.exists(path):
+        try:
+            normalizer = SkillNormalizer.load(path)
+            if normalizer.source == source:
+                return normalizer
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Rebuilding skill index: cannot load {path}: {e}")
+    normalizer = SkillNormalizer(SKILL_DB, SKILL_ALIASES, CASE_SENSITIVE_SKILLS, source=source)
+    if path:
+        try:
+            normalizer.save(path)
+        except OSError as e:
+            logger.warning(f"Cannot save skill index to {path}: {e}")
+    return normalizer
+
+
+def get_normalizer():
+    # Built (or loaded) once per process and shared by both services
+    global _normalizer
+    if _normalizer is None:
+        with _normalizer_lock:
+            if _normalizer is None:
+                _normalizer = load_normalizer(SKILL_INDEX_PATH)
+    return _normalizer
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Run from backend/ with `python -m pytest tests`. The tests import the
+# backend modules as top-level modules, the way app.py and jobscrap.py do.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+import app
+import batch_parser
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize('body, error', [
+    ({'resumes': 'Jane Doe\nPython developer'}, 'resumes must be a list of resume texts'),
+    ({'resumes': ['Jane Doe', 3]}, 'resumes must be a list of resume texts'),
+    (['Jane Doe'], 'Request body must be a JSON object'),
+    ({'resumes': ['Jane Doe'], 'workers': 'x'}, 'workers must be an integer'),
+    ({}, 'No resumes provided'),
+])
+def test_parse_batch_rejects_malformed_bodies(client, body, error):
+    response = client.post('/parse-batch', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': error}
+
+
+RESUME = 'Jane Doe\njane@example.com\n\nSkills\nPython, Docker, SQL\n\nExperience\nSoftware Engineer at Acme\nJan 2018 - Jan 2023\nBuilt services in Python.'
+
+
+def test_analyze_compares_resume_with_job_description(client):
+    body = {'resume': RESUME, 'jobDescription': 'We need Python and Kubernetes with 3+ years of experience.'}
+    result = client.post('/analyze', json=body).get_json()
+    assert result['success']
+    assert result['matchedSkills'] == ['Python']
+    assert result['missingSkills'] == ['Kubernetes']
+    assert result['skillsMatch'] == 50
+    assert result['suggestions'][0] == 'Add Kubernetes to your resume if you have worked with it.'
+    # The resume side is kept per content hash; only the posting is new work
+    again = client.post('/analyze', json=dict(body, jobDescription='Docker and SQL.')).get_json()
+    assert again['cached']
+    assert again['matchedSkills'] == ['Docker', 'SQL']
+    assert again['skillsMatch'] == 100
+
+
+@pytest.mark.parametrize('body', [
+    {'jobDescription': 'Python'},
+    {'resume': RESUME, 'jobDescription': '  '},
+    {'resume': 5, 'jobDescription': 'Python'},
+    ['resume'],
+])
+def test_analyze_rejects_missing_inputs(client, body):
+    assert client.post('/analyze', json=body).status_code == 400
+
+
+def ndjson_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_parse_text_streams_one_line_per_section(client):
+    text = RESUME + '\n\nStreamed once'
+    response = client.post('/parse-text?stream=1&fields=name,skills', json={'resume': text})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = ndjson_lines(response)
+    assert lines[0] == {'success': True, 'cached': False}
+    assert lines[1:] == [{'name': 'Jane Doe'}, {'skills': ['Python', 'Docker', 'SQL']}]
+    # The finished parse was cached, so a second stream replays it
+    again = client.post('/parse-text', json={'resume': text}, headers={'Accept': 'application/x-ndjson'})
+    assert ndjson_lines(again)[0] == {'success': True, 'cached': True}
+
+
+@pytest.fixture
+def batch_pool(monkeypatch):
+    # Workers are forked after the patch, so they never load the spaCy model
+    batch_parser.shutdown_pool()
+    monkeypatch.setitem(app.app.config, 'NER_FALLBACK', False)
+    yield
+    batch_parser.shutdown_pool()
+
+
+def test_parse_batch_streams_one_line_per_resume(client, batch_pool):
+    response = client.post('/parse-batch?stream=1&fields=name', json={'resumes': [RESUME, 'John Smith\nGo developer']})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = sorted(ndjson_lines(response), key=lambda line: line['index'])
+    assert [line['data'] for line in lines] == [{'name': 'Jane Doe'}, {'name': 'John Smith'}]
+    assert all(line['success'] for line in lines)
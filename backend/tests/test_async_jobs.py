@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import async_jobs
+
+DONE = {'success': True, 'data': {'name': 'Jane Doe'}}
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def gated(executor, gate):
+    # A submit function whose jobs finish only once gate is set
+    def submit(item):
+        return executor.submit(lambda: gate.wait(5) and {'success': True, 'data': {'text': item[1]}})
+    return submit
+
+
+def test_queue_full_until_a_job_finishes(executor):
+    gate = threading.Event()
+    queue = async_jobs.InProcessJobQueue(gated(executor, gate), workers=1, max_pending=2)
+    queue.submit('a.pdf', 'a')
+    second = queue.submit('b.pdf', 'b')
+    with pytest.raises(async_jobs.QueueFull):
+        queue.submit('c.pdf', 'c')
+    gate.set()
+    assert queue.wait(second, 'queued', timeout=5)['status'] in ('running', 'done')
+    assert queue.wait(second, 'running', timeout=5)['status'] == 'done'
+    assert queue.pending() == 0
+    queue.submit('c.pdf', 'c')
+
+
+def test_jobs_start_in_order_and_wake_waiters(executor):
+    gate = threading.Event()
+    queue = async_jobs.InProcessJobQueue(gated(executor, gate), workers=1)
+    first = queue.submit('a.pdf', 'a')
+    second = queue.submit('b.pdf', 'b')
+    assert queue.get(first)['status'] == 'running'
+    assert queue.get(second)['status'] == 'queued'
+    threading.Timer(0.05, gate.set).start()
+    started = time.monotonic()
+    # The second job starts when the first finishes, and its waiter is woken
+    # then rather than at the end of the timeout
+    assert queue.wait(second, 'queued', timeout=10)['status'] in ('running', 'done')
+    assert time.monotonic() - started < 5
+    assert queue.wait(second, 'running', timeout=5)['result']['data'] == {'text': 'b'}
+
+
+def test_failed_submission_fails_the_job_and_frees_its_slot():
+    def submit(item):
+        raise RuntimeError('pool is gone')
+
+    queue = async_jobs.InProcessJobQueue(submit, workers=1, max_pending=1)
+    job = queue.get(queue.submit('a.pdf', 'a'))
+    assert job['status'] == 'failed'
+    assert 'pool is gone' in job['result']['error']
+    assert queue.pending() == 0
+
+
+def test_finished_records_expire(executor):
+    queue = async_jobs.InProcessJobQueue(gated(executor, threading.Event()), result_ttl=0.05)
+    job_id = queue.add_finished('a.pdf', DONE)
+    assert queue.get(job_id)['result'] == DONE
+    time.sleep(0.1)
+    queue.add_finished('b.pdf', DONE)
+    assert queue.get(job_id) is None
+
+
+def test_sqlite_queue_runs_jobs_and_pushes_back(tmp_path):
+    gate = threading.Event()
+    stored = {}
+    queue = async_jobs.SqliteJobQueue(
+        str(tmp_path / 'jobs.db'),
+        lambda item: gate.wait(5) and {'success': True, 'data': {'text': item[1].decode()}},
+        workers=1, max_pending=2, result_ttl=0.05, on_success=stored.__setitem__, poll_interval=0.01
+    )
+    try:
+        first = queue.submit('a.pdf', b'a', key='text:a')
+        queue.submit('b.pdf', b'b', key='text:b')
+        with pytest.raises(async_jobs.QueueFull):
+            queue.submit('c.pdf', b'c')
+        gate.set()
+        assert queue.wait(first, 'queued', timeout=5)['status'] in ('running', 'done')
+        assert queue.wait(first, 'running', timeout=5)['result']['data'] == {'text': 'a'}
+        assert stored['text:a'] == {'text': 'a'}
+        time.sleep(0.1)
+        queue.add_finished('d.pdf', DONE)
+        assert queue.get(first) is None
+    finally:
+        queue.stop()
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+import app
+import batch_parser
+
+
+def parse_or_crash(item):
+    # Stands in for _parse_item in the pool's workers; 'crash' kills the
+    # worker the way a segfault inside a PDF library would
+    filename, payload = item
+    if payload == 'crash':
+        os._exit(1)
+    return {'success': True, 'filename': filename, 'data': payload.upper()}
+
+
+@pytest.fixture
+def crashing_pool(monkeypatch):
+    # Workers are forked after the patch, so they run parse_or_crash
+    batch_parser.shutdown_pool()
+    monkeypatch.setitem(app.app.config, 'NER_FALLBACK', False)
+    monkeypatch.setattr(batch_parser, '_parse_item', parse_or_crash)
+    yield
+    batch_parser.shutdown_pool()
+
+
+@pytest.mark.parametrize('max_in_flight', [None, 2])
+def test_worker_crash_fails_only_the_crashing_item(crashing_pool, max_in_flight):
+    items = ['a', 'b', 'crash', 'c', 'd', 'e']
+    results = batch_parser.parse_batch(items, workers=2, max_in_flight=max_in_flight)
+    assert [result['index'] for result in results] == list(range(len(items)))
+    assert [result['success'] for result in results] == [True, True, False, True, True, True]
+    assert results[2]['error'] == 'Worker process failed'
+    assert [result['data'] for result in results if result['success']] == ['A', 'B', 'C', 'D', 'E']
+
+
+def test_pool_is_usable_after_a_crash(crashing_pool):
+    batch_parser.parse_batch(['crash', 'a'], workers=2)
+    assert batch_parser.submit_item('b', workers=2).result(timeout=30)['data'] == 'B'
+
+
+def test_cached_items_are_not_parsed_again(crashing_pool):
+    cache = batch_parser.resume_cache.ResumeCache('test', max_bytes=1 << 20)
+    batch_parser.parse_batch(['a'], workers=1, cache=cache)
+    results = batch_parser.parse_batch(['a', 'b'], workers=1, cache=cache)
+    assert [(result['data'], result['cached']) for result in results] == [('A', True), ('B', False)]
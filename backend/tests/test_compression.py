@@ -0,0 +1,70 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify
+
+import compression
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config['COMPRESS_MIN_SIZE'] = 100
+    compression.compress_responses(app)
+
+    @app.route('/big')
+    def big():
+        return jsonify({'skills': ['Python'] * 100})
+
+    @app.route('/small')
+    def small():
+        return jsonify({'skills': ['Python']})
+
+    @app.route('/html')
+    def html():
+        return '<p>' + 'Python ' * 100 + '</p>'
+
+    @app.route('/stream')
+    def stream():
+        return Response((json.dumps({'index': i}) + '\n' for i in range(3)), mimetype='application/x-ndjson')
+
+    return app.test_client()
+
+
+def test_gzip_when_brotli_is_not_accepted(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert json.loads(gzip.decompress(response.data)) == {'skills': ['Python'] * 100}
+
+
+def test_brotli_preferred_when_accepted(client):
+    brotli = pytest.importorskip('brotli')
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.data)) == {'skills': ['Python'] * 100}
+
+
+@pytest.mark.parametrize('path, headers', [
+    ('/big', {}),
+    ('/small', {'Accept-Encoding': 'gzip'}),
+    ('/html', {'Accept-Encoding': 'gzip'}),
+])
+def test_left_uncompressed(client, path, headers):
+    response = client.get(path, headers=headers)
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_streamed_lines_are_flushed_as_they_are_written(client):
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    decompressor = zlib.decompressobj(31)
+    chunks = iter(response.response)
+    # Each chunk decompresses on its own to the line written for it
+    for i in range(3):
+        assert json.loads(decompressor.decompress(next(chunks))) == {'index': i}
+    decompressor.decompress(b''.join(chunks))
+    assert decompressor.eof
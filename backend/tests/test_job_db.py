@@ -0,0 +1,63 @@
+import pytest
+
+from job_db import JobDatabase
+
+
+def job(job_id, title, skills=(), location="Remote", company="Acme", posted_date="2026-01-01", description=""):
+    return {"id": job_id, "title": title, "skills": list(skills), "location": location, "company": company,
+            "postedDate": posted_date, "description": description}
+
+
+@pytest.fixture
+def job_db(tmp_path):
+    db = JobDatabase(str(tmp_path / "jobs.db"))
+    yield db
+    db.close()
+
+
+def test_search_ranks_by_matched_skills_and_pages(job_db):
+    job_db.upsert([
+        job("1", "Backend", ["Python"]),
+        job("2", "Full stack", ["Python", "React", "SQL"]),
+        job("3", "Data", ["Python", "SQL"]),
+        job("4", "Design", ["Figma"]),
+    ])
+    jobs, has_more = job_db.search(["python", "sql", "react"], limit=2)
+    assert [found["id"] for found in jobs] == ["2", "3"]
+    assert [found["matchScore"] for found in jobs] == [0.9, 0.8]
+    assert has_more
+    jobs, has_more = job_db.search(["python", "sql", "react"], limit=2, offset=2)
+    assert [found["id"] for found in jobs] == ["1"]
+    assert not has_more
+
+
+def test_search_keeps_symbol_skills_apart(job_db):
+    job_db.upsert([job("1", "Systems", ["C++"]), job("2", "Dotnet", ["C#"]), job("3", "Embedded", ["C"])])
+    assert [found["id"] for found in job_db.search(["C++"])[0]] == ["1"]
+    assert [found["id"] for found in job_db.search(["C#"])[0]] == ["2"]
+    assert [found["id"] for found in job_db.search(["c"])[0]] == ["3"]
+
+
+def test_search_filters_and_lists_newest_first(job_db):
+    job_db.upsert([
+        job("1", "Old", ["Python"], location="Berlin", posted_date="2026-01-01"),
+        job("2", "New", ["Python"], location="berlin", posted_date="2026-03-01"),
+        job("3", "Elsewhere", ["Python"], location="Paris", posted_date="2026-02-01"),
+    ])
+    assert [found["id"] for found in job_db.search(location="BERLIN")[0]] == ["2", "1"]
+    assert [found["id"] for found in job_db.search(["python"], posted_after="2026-02-01")[0]] == ["2", "3"]
+    assert [found["id"] for found in job_db.search()[0]] == ["2", "3", "1"]
+
+
+def test_upsert_refreshes_skills_of_stored_jobs(job_db):
+    job_db.upsert([job("1", "Platform", ["Docker"])])
+    job_db.upsert([job("1", "Platform", ["Docker", "Kubernetes"])])
+    assert len(job_db) == 1
+    jobs, _ = job_db.search(["kubernetes"])
+    assert [found["skills"] for found in jobs] == [["Docker", "Kubernetes"]]
+
+
+def test_empty(job_db):
+    assert job_db.empty()
+    job_db.upsert([job("1", "Backend")])
+    assert not job_db.empty()
@@ -0,0 +1,22 @@
+from job_index import JobIndex
+from records import skill_vocabulary
+
+JOBS = [
+    {"id": "1", "title": "Backend", "skills": ["Python", "SQL"]},
+    {"id": "2", "title": "Frontend", "skills": ["React", "TypeScript"]},
+    {"id": "3", "title": "Full stack", "skills": ["Python", "React", "SQL"]},
+]
+
+
+def test_match_skills_orders_by_overlap():
+    index = JobIndex(JOBS)
+    assert [job["id"] for job in index.match_skills(["Python", "SQL", "React"], limit=5)] == ["3", "1", "2"]
+    assert [job["id"] for job in index.match_skills(["python"], limit=1)] == ["1"]
+
+
+def test_unknown_query_skills_do_not_grow_the_vocabulary():
+    index = JobIndex(JOBS)
+    size = len(skill_vocabulary)
+    assert index.match_skills([f"Made Up Skill {i}" for i in range(200)]) == []
+    assert [job["id"] for job in index.match_skills(["Made Up Skill", "TypeScript"])] == ["2"]
+    assert len(skill_vocabulary) == size
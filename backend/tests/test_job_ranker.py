@@ -0,0 +1,19 @@
+from job_ranker import TfidfJobRanker
+
+JOBS = [
+    {"id": "1", "title": "Python Developer", "description": "Django services and PostgreSQL", "skills": ["Python"]},
+    {"id": "2", "title": "Frontend Engineer", "description": "React and TypeScript interfaces", "skills": ["React"]},
+    {"id": "3", "title": "Data Engineer", "description": "Python pipelines on Spark", "skills": ["Python", "Spark"]},
+]
+
+
+def test_rank_returns_best_matches_first():
+    ranked = TfidfJobRanker(JOBS).rank("react typescript", limit=2)
+    assert [job.id for job, _ in ranked] == ["2"]
+    assert [job.id for job, _ in TfidfJobRanker(JOBS).rank("python spark pipelines", limit=2)][0] == "3"
+
+
+def test_rank_without_a_usable_corpus_or_query():
+    assert TfidfJobRanker([]).rank("python") == []
+    assert TfidfJobRanker([{"id": "1", "title": "the", "description": "and"}]).rank("python") == []
+    assert TfidfJobRanker(JOBS).rank("   ") == []
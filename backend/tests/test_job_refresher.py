@@ -0,0 +1,153 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from job_refresher import JobRefresher
+from job_sources import DEFAULT_HEADERS, JobSource, SourceFetcher
+
+
+class StandInBoard:
+    # A local HTTP server standing in for a job board. The page is one job
+    # title per line; it carries an ETag, conditional requests for an
+    # unchanged page get a 304 and fail makes every request a 500.
+
+    def __init__(self, body):
+        self.body = body
+        self.fail = False
+        self.statuses = []
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                etag = '"%s"' % hashlib.sha256(board.body.encode("utf-8")).hexdigest()[:16]
+                if board.fail:
+                    status = 500
+                elif self.headers.get("If-None-Match") == etag:
+                    status = 304
+                else:
+                    status = 200
+                board.statuses.append(status)
+                self.send_response(status)
+                if status == 200:
+                    body = board.body.encode("utf-8")
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def board():
+    board = StandInBoard("Python Developer\nData Engineer")
+    yield board
+    board.close()
+
+
+@pytest.fixture
+def make_refresher(board):
+    fetcher = SourceFetcher(max_workers=2, timeout=5, retries=0)
+    parsed = []
+    changes = []
+
+    def parse(html):
+        parsed.append(html)
+        titles = html.splitlines() if html is not None else []
+        return [{"id": title, "title": title} for title in titles]
+
+    source = JobSource("stand-in", board.url, parse, DEFAULT_HEADERS, 0)
+    refreshers = []
+
+    def make(**options):
+        options.setdefault("ttl", 60)
+        refresher = JobRefresher(fetcher, sources=lambda: [source], on_change=changes.append, **options)
+        refresher.parsed, refresher.changes = parsed, changes
+        refreshers.append(refresher)
+        return refresher
+
+    yield make
+    for refresher in refreshers:
+        refresher.stop()
+    fetcher.close()
+
+
+def titles(snapshot):
+    return [job.title for job in snapshot.index.jobs.records()]
+
+
+def test_first_refresh_publishes_snapshot(board, make_refresher):
+    refresher = make_refresher()
+    snapshot = refresher.refresh()
+    assert titles(snapshot) == ["Python Developer", "Data Engineer"]
+    assert refresher.snapshot is snapshot
+    assert refresher.changes == [snapshot]
+    assert board.statuses == [200]
+
+
+def test_unchanged_page_is_not_parsed_again(board, make_refresher):
+    refresher = make_refresher()
+    first = refresher.refresh()
+    second = refresher.refresh()
+    assert board.statuses == [200, 304]
+    assert len(refresher.parsed) == 1
+    assert second.index is first.index
+    assert second.fetched_at >= first.fetched_at
+    assert len(refresher.changes) == 1
+
+
+def test_changed_page_builds_new_index(board, make_refresher):
+    refresher = make_refresher()
+    first = refresher.refresh()
+    board.body = "Go Developer"
+    second = refresher.refresh()
+    assert board.statuses == [200, 200]
+    assert titles(second) == ["Go Developer"]
+    assert second.index is not first.index
+    assert refresher.changes == [first, second]
+
+
+def test_failed_fetch_keeps_serving_previous_jobs(board, make_refresher):
+    refresher = make_refresher()
+    first = refresher.refresh()
+    board.fail = True
+    second = refresher.refresh()
+    assert board.statuses == [200, 500]
+    assert second.index is first.index
+    assert len(refresher.changes) == 1
+
+
+def test_stale_snapshot_is_served_while_revalidating(board, make_refresher):
+    refresher = make_refresher(ttl=0.05, interval=60)
+    first = refresher.get_snapshot()
+    board.body = "Go Developer"
+    time.sleep(0.1)
+    assert refresher.get_snapshot() is first
+    deadline = time.monotonic() + 5
+    while refresher.snapshot is first and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert titles(refresher.get_snapshot()) == ["Go Developer"]
+
+
+def test_ranker_is_published_with_its_index(board, make_refresher):
+    refresher = make_refresher(build_ranker=list)
+    first = refresher.refresh()
+    assert [job.title for job in first.ranker] == titles(first)
+    assert refresher.refresh().ranker is first.ranker
+    board.body = "Go Developer"
+    assert [job.title for job in refresher.refresh().ranker] == ["Go Developer"]
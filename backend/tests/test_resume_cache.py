@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+import app
+import resume_cache
+
+
+@pytest.fixture
+def broken_cache(tmp_path):
+    # A persistent cache whose table has gone missing under it, so every
+    # SQLite read and write fails
+    path = str(tmp_path / 'cache.db')
+    cache = resume_cache.ResumeCache('test', db_path=path)
+    db = sqlite3.connect(path)
+    db.execute('DROP TABLE resume_cache')
+    db.commit()
+    db.close()
+    yield cache
+    cache.close()
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = resume_cache.ResumeCache('test', db_path=path)
+    cache.put('text:a', {'name': 'Jane Doe'})
+    cache.close()
+    assert resume_cache.ResumeCache('test', db_path=path).get('text:a') == {'name': 'Jane Doe'}
+    assert resume_cache.ResumeCache('other', db_path=path).get('text:a') is None
+
+
+def test_sqlite_errors_are_not_raised(broken_cache):
+    broken_cache.put('text:a', {'name': 'Jane Doe'})
+    assert broken_cache.get('text:a') == {'name': 'Jane Doe'}
+    assert broken_cache.get('text:b') is None
+
+
+def test_parse_text_succeeds_with_a_failing_cache(broken_cache, monkeypatch):
+    monkeypatch.setattr(app, 'parse_cache', broken_cache)
+    response = app.app.test_client().post('/parse-text', json={'resume': 'Jane Doe\njane@example.com\nSkills\nPython'})
+    assert response.status_code == 200
+    assert response.get_json()['data']['skills'] == ['Python']
@@ -0,0 +1,60 @@
+import random
+import re
+
+import app
+
+
+# Section segmentation as it was before segment_sections: header lines found
+# by substring search, then each section's entries split out separately
+def reference_boundaries(lines):
+    boundaries = {}
+    current = None
+    for i, line in enumerate(lines):
+        line_lower = line.lower().strip()
+        for section, headers in app.SECTION_HEADERS.items():
+            if any(header in line_lower for header in headers):
+                if current:
+                    boundaries[current]['end'] = i
+                current = section
+                boundaries[current] = {'start': i + 1, 'end': len(lines)}
+    return boundaries
+
+
+def reference_content(lines, boundaries, section):
+    date_pattern = r'\b(?:\d{4}\s*-\s*(?:\d{4}|Present)|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s*\d{2,4})\b'
+    content, entry = [], []
+    for i in range(boundaries[section]['start'], boundaries[section]['end']):
+        line = lines[i].strip()
+        if section == 'education' and entry and (re.search(date_pattern, line.lower()) or any(keyword in line.lower() for keyword in app.DEGREE_KEYWORDS)):
+            content.append(entry)
+            entry = [line]
+        elif not line:
+            if entry:
+                content.append(entry)
+            entry = []
+        else:
+            entry.append(line)
+    if entry:
+        content.append(entry)
+    return content
+
+
+LINES = [
+    'Skills', 'Technical Skills & Certifications', 'Experience', 'Project Experience', 'Education', 'EDUCATION',
+    'Projects', 'Awards', 'Summary', 'Profile', 'Contact', '', '', ' ', 'Python developer', 'B.Tech in CS',
+    '2015 - 2019', 'Jan 2020 - Present', 'Master of Science', 'worked on projects with recognition',
+    'Secondary School', 'MIT', 'Acme Corp at NYC', 'used React and SQL', '   indented line  ',
+]
+
+
+def test_segment_sections_matches_reference_on_random_layouts():
+    rng = random.Random(5)
+    for _ in range(5000):
+        lines = [line.strip() for line in '\n'.join(rng.choices(LINES, k=rng.randint(0, 60))).split('\n')]
+        boundaries = reference_boundaries(lines)
+        expected = {section: reference_content(lines, boundaries, section) for section in boundaries}
+        # Sections whose header was immediately followed by another header
+        # end up empty in both; only non-empty ones are compared
+        expected = {section: content for section, content in expected.items() if content}
+        actual = {section: content for section, content in app.segment_sections(lines).items() if content}
+        assert actual == expected, lines
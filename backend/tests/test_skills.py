@@ -0,0 +1,40 @@
+import re
+
+import pytest
+
+import app
+import skill_tables
+from benchmarks.corpus import generate_resumes
+
+
+def exact_skills(text):
+    # Skill extraction before the normalizer: every SKILL_DB entry found as
+    # written, on word boundaries, ignoring case
+    return {skill for skill in skill_tables.SKILL_DB if re.search(r"\b" + re.escape(skill) + r"\b", text, re.IGNORECASE)}
+
+
+@pytest.mark.parametrize("scale", [1, 2, 5])
+def test_same_skills_as_exact_matching_on_benchmark_corpus(scale):
+    for text in generate_resumes(200, scale=scale, seed=scale):
+        assert set(app.extract_skills_from_text(text)) == exact_skills(text)
+
+
+def test_aliases_and_spellings_are_normalized():
+    text = "Worked with k8s, ReactJS, golang, Node JS and Postgres."
+    assert app.extract_skills_from_text(text) == ["Kubernetes", "React", "Go", "Node.js", "PostgreSQL"]
+
+
+def test_tokens_are_not_joined_across_sentences():
+    assert "Teamwork" not in app.extract_skills_from_text("Mentored the team.\n\nWork Experience")
+    assert "Teamwork" not in app.extract_skills_from_text("Mentored the team. Work was reviewed.")
+
+
+def test_overlapping_skills_are_all_found():
+    assert app.extract_skills_from_text("Big Data Visualization") == ["Big Data", "Data Visualization"]
+    # A mention wholly inside another is not a second skill
+    assert app.extract_skills_from_text("Built APIs in Node.js") == ["Node.js"]
+
+
+def test_case_sensitive_names_match_only_as_written():
+    assert app.extract_skills_from_text("Services in Go and Python") == ["Go", "Python"]
+    assert app.extract_skills_from_text("GO home, go team") == []
@@ -0,0 +1,78 @@
+"""Production entry point for the resume parser and job matcher.
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:application
+
+SERVE_APPS selects what the process serves: "parser" (app.py), "jobs"
+(jobscrap.py) or "parser,jobs" (the default). With both, the job matcher is
+mounted under JOBS_MOUNT, so one server and one set of workers answers the
+parser's routes and /api/match-jobs without a second service. gunicorn.conf.py
+documents worker and thread sizing, and that /metrics covers one worker only.
+
+With preload_app, this module is imported once in the gunicorn master, which
+loads the apps, the skill index and the spaCy model before forking, so the
+workers share those pages copy-on-write instead of loading one copy each.
+`python app.py` and `python jobscrap.py` remain the development servers.
+"""
+import gc
+import logging
+import os
+
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+logger = logging.getLogger(__name__)
+
+SERVE_APPS = [name.strip() for name in os.environ.get('SERVE_APPS', 'parser,jobs').split(',') if name.strip()]
+JOBS_MOUNT = os.environ.get('JOBS_MOUNT', '/api/match-jobs')
+
+
+def load_parser():
+    import app
+    import ocr
+    if app.app.config['NER_FALLBACK']:
+        try:
+            app.get_nlp()
+        except Exception as e:
+            logger.warning(f"spaCy model not preloaded, workers will load it on first use: {e}")
+    # Workers must not share the master's SQLite connections; they reopen
+    # their own on first use
+    app.parse_cache.close()
+    ocr.page_cache.close()
+    return app.app
+
+
+def load_jobs():
+    import jobscrap
+    jobscrap.job_db.close()
+    return jobscrap.app
+
+
+def serve_mount_point(wsgi_app):
+    # The job matcher answers on "/", so a request for the mount point itself
+    # (/api/match-jobs, as the frontend calls it) is passed on as "/" rather
+    # than redirected to add a trailing slash
+    def mounted(environ, start_response):
+        if not environ.get('PATH_INFO'):
+            environ['PATH_INFO'] = '/'
+        return wsgi_app(environ, start_response)
+    return mounted
+
+
+def create_application(names):
+    unknown = set(names) - {'parser', 'jobs'}
+    if unknown or not names:
+        raise ValueError(f"SERVE_APPS must name parser and/or jobs, got {','.join(names)!r}")
+    if set(names) == {'jobs'}:
+        return load_jobs()
+    parser_app = load_parser()
+    if 'jobs' not in names:
+        return parser_app
+    return DispatcherMiddleware(parser_app, {JOBS_MOUNT: serve_mount_point(load_jobs())})
+
+
+application = create_application(SERVE_APPS)
+
+# Everything loaded so far is shared with the workers; moving it out of the
+# collector's generations keeps collections in the workers from writing to
+# (and so copying) those pages.
+gc.collect()
+gc.freeze()